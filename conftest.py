@@ -0,0 +1,39 @@
+"""
+Shared pytest fixtures.
+
+The src directory is added to sys.path once here, and the heavy managers and
+the compiled workflow are session fixtures, so their import chains
+(LangChain, SQLAlchemy, pandas) are paid once per test run.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.absolute()
+SRC_DIR = PROJECT_ROOT / "src"
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+@pytest.fixture(scope="session")
+def db_mgr():
+    """Shared database manager."""
+    from database_manager import db_manager
+    return db_manager
+
+
+@pytest.fixture(scope="session")
+def agent_mgr():
+    """Shared agent manager."""
+    from agent_manager import agent_manager
+    return agent_manager
+
+
+@pytest.fixture(scope="session")
+def workflow_app():
+    """Compiled LangGraph workflow."""
+    from main import get_app
+    return get_app()
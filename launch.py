@@ -8,7 +8,75 @@ Comprehensive launcher with multiple options for running the AI Data Analyst sys
 import os
 import sys
 import subprocess
+import functools
+import multiprocessing
 from pathlib import Path
+from typing import Optional
+
+# Keeping inherited file descriptors lets CPython launch children via
+# posix_spawn() instead of fork()+exec(), which avoids copying the parent's
+# page tables on every launch.
+SPAWN_OPTIONS = {"close_fds": False, "bufsize": -1}
+
+@functools.lru_cache(maxsize=None)
+def _venv_python() -> Optional[Path]:
+    """Locate the virtual environment's interpreter (Windows or POSIX layout)."""
+    for path in (Path("venv/Scripts/python.exe"), Path("venv/bin/python")):
+        if path.exists():
+            return path
+    return None
+
+# Modules imported once by the forkserver so utility runs fork a warm image
+FORKSERVER_PRELOAD = ["pandas", "sqlite3", "numpy"]
+
+def _run_script_main(script):
+    """Load a project script by path and call its main() (forkserver child target)."""
+    import runpy
+    
+    for path in (str(Path("src").absolute()), str(Path(script).parent.absolute())):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    
+    result = runpy.run_path(script)["main"]()
+    if result is False:
+        sys.exit(1)
+
+def run_utility(script, python=sys.executable):
+    """
+    Run a project script's main().
+    
+    When the script is to run under this launcher's own interpreter on POSIX, it
+    runs in a child forked from a forkserver that has the heavy data modules
+    preloaded. Any other interpreter (such as the venv's) and other platforms
+    get a fresh interpreter process.
+    Raises subprocess.CalledProcessError on a non-zero exit code.
+    """
+    # A venv interpreter may be a symlink to this binary, but its site-packages
+    # differ, so the paths are compared without resolving links
+    same_interpreter = Path(python).absolute() == Path(sys.executable).absolute()
+    if os.name != "posix" or not same_interpreter:
+        # Relay the child's output line by line so a full pipe never blocks it
+        process = subprocess.Popen(
+            [str(python), "-u", script],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            **SPAWN_OPTIONS
+        )
+        for line in process.stdout:
+            sys.stdout.write(line)
+        returncode = process.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, process.args)
+        return
+    
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(FORKSERVER_PRELOAD)
+    process = context.Process(target=_run_script_main, args=(script,))
+    process.start()
+    process.join()
+    if process.exitcode:
+        raise subprocess.CalledProcessError(process.exitcode, script)
 
 def main():
     """Main launcher with menu options"""
@@ -54,8 +122,8 @@ def launch_web_interface():
     print("\n🌐 Launching AI Data Analyst Web Interface...")
     
     # Check for virtual environment
-    venv_python = Path("venv/Scripts/python.exe")
-    if not venv_python.exists():
+    venv_python = _venv_python()
+    if venv_python is None:
         print("❌ Virtual environment not found!")
         print("Please run: python -m venv venv")
         print("Then activate and install requirements")
@@ -70,7 +138,7 @@ def launch_web_interface():
         ]
         
         print("🌐 Opening at: http://localhost:8502")
-        subprocess.run(cmd)
+        subprocess.run(cmd, **SPAWN_OPTIONS)
         
     except KeyboardInterrupt:
         print("\n👋 Web interface closed")
@@ -82,7 +150,7 @@ def run_test_suite():
     print("\n🧪 Running Comprehensive Test Suite...")
     
     try:
-        subprocess.run([sys.executable, "test_unified.py"], check=True)
+        run_utility("test_unified.py")
         print("✅ All tests completed!")
     except subprocess.CalledProcessError as e:
         print(f"❌ Tests failed with exit code {e.returncode}")
@@ -94,13 +162,13 @@ def enhance_database():
     print("\n🔧 Running Database Enhancements...")
     
     # Check for virtual environment
-    venv_python = Path("venv/Scripts/python.exe")
-    if not venv_python.exists():
+    venv_python = _venv_python()
+    if venv_python is None:
         print("❌ Virtual environment not found!")
         return
     
     try:
-        subprocess.run([str(venv_python), "utilities/enhance_database.py"], check=True)
+        run_utility("utilities/enhance_database.py", venv_python)
         print("✅ Database enhancements completed!")
     except subprocess.CalledProcessError as e:
         print(f"❌ Database enhancement failed with exit code {e.returncode}")
@@ -112,13 +180,13 @@ def create_sample_datasets():
     print("\n📊 Creating Sample Datasets...")
     
     # Check for virtual environment
-    venv_python = Path("venv/Scripts/python.exe")
-    if not venv_python.exists():
+    venv_python = _venv_python()
+    if venv_python is None:
         print("❌ Virtual environment not found!")
         return
     
     try:
-        subprocess.run([str(venv_python), "utilities/create_sample_datasets.py"], check=True)
+        run_utility("utilities/create_sample_datasets.py", venv_python)
         print("✅ Sample datasets created in sample_datasets/ folder!")
     except subprocess.CalledProcessError as e:
         print(f"❌ Sample dataset creation failed with exit code {e.returncode}")
@@ -8,7 +8,18 @@ Simple launcher that starts the web interface directly.
 import subprocess
 import sys
 import os
+import functools
 from pathlib import Path
+from typing import Optional
+
+@functools.lru_cache(maxsize=None)
+def _venv_python() -> Optional[Path]:
+    """Locate the virtual environment's interpreter (Windows or POSIX layout)."""
+    project_root = Path(__file__).parent.absolute()
+    for path in (project_root / "venv" / "Scripts" / "python.exe", project_root / "venv" / "bin" / "python"):
+        if path.exists():
+            return path
+    return None
 
 def main():
     """Launch the AI Data Analyst web interface"""
@@ -19,8 +30,8 @@ def main():
     os.chdir(project_root)
     
     # Check for virtual environment
-    venv_python = project_root / "venv" / "Scripts" / "python.exe"
-    if not venv_python.exists():
+    venv_python = _venv_python()
+    if venv_python is None:
         print("❌ Virtual environment not found!")
         print("Please run: python -m venv venv")
         print("Then activate and install requirements")
@@ -36,7 +47,8 @@ def main():
         ]
         
         print("🌐 Opening at: http://localhost:8502")
-        subprocess.run(cmd)
+        # close_fds=False lets CPython use posix_spawn() instead of fork()+exec()
+        subprocess.run(cmd, close_fds=False, bufsize=-1)
         
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
@@ -4,23 +4,42 @@ Simple Database Test - Direct SQLite Operations
 Tests database connectivity and CSV-to-SQL without complex imports
 """
 
+import csv
 import sqlite3
-import pandas as pd
 import os
 from pathlib import Path
 
-def test_basic_database():
+DB_PATH = "data/sales.db"
+
+def open_test_connection(db_path=DB_PATH):
+    """
+    Open a connection tuned for the read-heavy test workload.
+    
+    The connection is in autocommit mode so each test controls its own transactions.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+def quote_identifier(name):
+    """Quote a table name for safe interpolation into SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+def test_basic_database(conn=None):
     """Test basic database operations"""
     print("🔍 Testing Basic Database Connection...")
     
-    db_path = "data/sales.db"
-    
-    if not os.path.exists(db_path):
-        print(f"❌ Database file not found: {db_path}")
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database file not found: {DB_PATH}")
         return False
     
+    owns_conn = conn is None
     try:
-        conn = sqlite3.connect(db_path)
+        if owns_conn:
+            conn = open_test_connection()
         cursor = conn.cursor()
         
         # Test connection
@@ -29,81 +48,105 @@ def test_basic_database():
         print(f"✅ SQLite Version: {version[0]}")
         
         # Get all tables
+        cursor.execute("BEGIN DEFERRED;")
+        cursor.arraysize = 1000
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
         tables = cursor.fetchall()
         
+        # Fetch every table's row count in a single statement
+        row_counts = {}
+        if tables:
+            count_sql = " UNION ALL ".join(
+                f"SELECT ?, COUNT(*) FROM {quote_identifier(table_name)}" for (table_name,) in tables
+            )
+            cursor.execute(count_sql, [table_name for (table_name,) in tables])
+            row_counts = dict(cursor.fetchall())
+        
+        # Fetch every table's columns in a single statement
+        cursor.execute(
+            "SELECT m.name, p.name FROM sqlite_master m "
+            "JOIN pragma_table_info(m.name) p WHERE m.type='table' ORDER BY m.name, p.cid;"
+        )
+        table_columns = {}
+        for table_name, column_name in cursor.fetchall():
+            table_columns.setdefault(table_name, []).append(column_name)
+        
         print(f"✅ Found {len(tables)} tables:")
         for (table_name,) in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            row_count = cursor.fetchone()[0]
-            
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
+            row_count = row_counts[table_name]
+            columns = table_columns.get(table_name, [])
             
             print(f"   📋 {table_name}: {row_count} rows, {len(columns)} columns")
-            print(f"      Columns: {', '.join([col[1] for col in columns])}")
+            print(f"      Columns: {', '.join(columns)}")
             
             # Show sample data
             if row_count > 0:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 2;")
+                cursor.execute(f"SELECT * FROM {quote_identifier(table_name)} LIMIT ?;", (2,))
                 sample_data = cursor.fetchall()
                 print(f"      Sample: {sample_data[0] if sample_data else 'No data'}")
         
-        conn.close()
+        cursor.execute("COMMIT;")
         return True
         
     except Exception as e:
         print(f"❌ Database test failed: {e}")
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
         return False
+    finally:
+        if owns_conn and conn is not None:
+            conn.close()
 
-def test_csv_upload():
+def test_csv_upload(conn=None):
     """Test CSV upload and conversion to SQL"""
     print("\n🔄 Testing CSV Upload & SQL Conversion...")
     
+    owns_conn = conn is None
     try:
         # Create test CSV
-        test_data = {
-            'id': [1, 2, 3, 4, 5],
-            'product': ['Laptop', 'Mouse', 'Monitor', 'Keyboard', 'Webcam'],
-            'price': [1299.99, 29.99, 449.99, 89.99, 79.99],
-            'category': ['Electronics', 'Accessories', 'Electronics', 'Accessories', 'Electronics']
-        }
-        
-        df = pd.DataFrame(test_data)
+        headers = ['id', 'product', 'price', 'category']
+        ids = [1, 2, 3, 4, 5]
+        products = ['Laptop', 'Mouse', 'Monitor', 'Keyboard', 'Webcam']
+        prices = [1299.99, 29.99, 449.99, 89.99, 79.99]
+        categories = ['Electronics', 'Accessories', 'Electronics', 'Accessories', 'Electronics']
+        rows = list(zip(ids, products, prices, categories))
+        
         csv_file = "test_upload.csv"
-        df.to_csv(csv_file, index=False)
+        with open(csv_file, 'w', newline='') as f:
+            csv.writer(f).writerows([headers] + rows)
         print(f"✅ Created test CSV: {csv_file}")
         
-        # Read CSV back
-        df_loaded = pd.read_csv(csv_file)
-        print(f"✅ Loaded CSV: {len(df_loaded)} rows, {len(df_loaded.columns)} columns")
-        print(f"   Columns: {list(df_loaded.columns)}")
-        print(f"   Data types: {dict(df_loaded.dtypes)}")
+        # Read CSV back, restoring the column types
+        converters = (int, str, float, str)
+        with open(csv_file, newline='') as f:
+            reader = csv.reader(f)
+            loaded_headers = next(reader)
+            loaded_rows = [tuple(convert(v) for convert, v in zip(converters, row)) for row in reader]
+        print(f"✅ Loaded CSV: {len(loaded_rows)} rows, {len(loaded_headers)} columns")
+        print(f"   Columns: {loaded_headers}")
+        print(f"   Data types: {[type(v).__name__ for v in loaded_rows[0]]}")
         
         # Create SQL table
-        db_path = "data/sales.db"
-        conn = sqlite3.connect(db_path)
+        if owns_conn:
+            conn = open_test_connection()
         cursor = conn.cursor()
         
-        # Drop existing test table
+        # Replace the table and insert data in one transaction
+        cursor.execute("BEGIN;")
         cursor.execute("DROP TABLE IF EXISTS test_upload")
-        
-        # Create table with proper types
-        create_sql = """
+        # STRICT tables need SQLite 3.37+; id is a natural key so no rowid is needed
+        table_options = " STRICT, WITHOUT ROWID" if sqlite3.sqlite_version_info >= (3, 37, 0) else " WITHOUT ROWID"
+        cursor.execute(f"""
         CREATE TABLE test_upload (
-            id INTEGER,
-            product TEXT,
-            price REAL,
-            category TEXT
-        )
-        """
-        
-        cursor.execute(create_sql)
-        print("✅ Created test_upload table")
-        
-        # Insert data
-        df_loaded.to_sql('test_upload', conn, if_exists='replace', index=False)
-        print("✅ Inserted CSV data into SQL table")
+            id INTEGER PRIMARY KEY,
+            product TEXT NOT NULL,
+            price REAL NOT NULL,
+            category TEXT NOT NULL
+        ){table_options}
+        """)
+        cursor.executemany("INSERT INTO test_upload VALUES (?, ?, ?, ?)", loaded_rows)
+        cursor.execute("COMMIT;")
+        print("✅ Created test_upload table and inserted CSV data")
         
         # Verify data
         cursor.execute("SELECT COUNT(*) FROM test_upload")
@@ -124,8 +167,6 @@ def test_csv_upload():
         for row in analysis:
             print(f"   📈 {row[0]}: {row[1]} items, avg price ${row[2]:.2f}")
         
-        conn.close()
-        
         # Clean up
         os.remove(csv_file)
         print("✅ Test CSV cleaned up")
@@ -134,30 +175,37 @@ def test_csv_upload():
         
     except Exception as e:
         print(f"❌ CSV upload test failed: {e}")
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
         return False
+    finally:
+        if owns_conn and conn is not None:
+            conn.close()
 
-def test_existing_data():
+def test_existing_data(conn=None):
     """Test operations on existing sales data"""
     print("\n📊 Testing Existing Sales Data Operations...")
     
+    owns_conn = conn is None
     try:
-        db_path = "data/sales.db"
-        conn = sqlite3.connect(db_path)
+        if owns_conn:
+            conn = open_test_connection()
         cursor = conn.cursor()
         
-        # Test complex queries
-        test_queries = [
-            ("Total Sales", "SELECT SUM(Sale) FROM sales"),
-            ("Top Regions", "SELECT Region, SUM(Sale) FROM sales GROUP BY Region ORDER BY SUM(Sale) DESC LIMIT 3"),
-            ("Product Count", "SELECT COUNT(DISTINCT Product) FROM sales"),
-            ("Average Sale", "SELECT AVG(Sale) FROM sales"),
-            ("Date Range", "SELECT MIN(Date), MAX(Date) FROM sales")
-        ]
+        # Scalar aggregates share a single scan of the sales table
+        cursor.execute(
+            "SELECT SUM(Sale), COUNT(DISTINCT Product), AVG(Sale), MIN(Date), MAX(Date) FROM sales"
+        )
+        total_sales, product_count, average_sale, first_date, last_date = cursor.fetchone()
+        print(f"   ✅ Total Sales: {total_sales}")
+        
+        # Top regions needs its own GROUP BY
+        cursor.execute("SELECT Region, SUM(Sale) FROM sales GROUP BY Region ORDER BY SUM(Sale) DESC LIMIT 3")
+        print(f"   ✅ Top Regions: {cursor.fetchone()}")
         
-        for query_name, sql in test_queries:
-            cursor.execute(sql)
-            result = cursor.fetchone()
-            print(f"   ✅ {query_name}: {result}")
+        print(f"   ✅ Product Count: {product_count}")
+        print(f"   ✅ Average Sale: {average_sale}")
+        print(f"   ✅ Date Range: {(first_date, last_date)}")
         
         # Test joins if multiple tables exist
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -166,12 +214,14 @@ def test_existing_data():
         if len(tables) > 1:
             print(f"✅ Multiple tables available for joins: {tables}")
         
-        conn.close()
         return True
         
     except Exception as e:
         print(f"❌ Existing data test failed: {e}")
         return False
+    finally:
+        if owns_conn and conn is not None:
+            conn.close()
 
 def main():
     """Run all database tests"""
@@ -187,17 +237,26 @@ def main():
     passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
-        print(f"\n{'='*20} {test_name} {'='*20}")
-        try:
-            success = test_func()
-            if success:
-                passed += 1
-                print(f"✅ {test_name}: PASSED")
-            else:
-                print(f"❌ {test_name}: FAILED")
-        except Exception as e:
-            print(f"❌ {test_name}: FAILED - {e}")
+    if not os.path.exists(DB_PATH):
+        print(f"❌ Database file not found: {DB_PATH}")
+        return False
+    
+    # Share one connection across all tests
+    conn = open_test_connection()
+    try:
+        for test_name, test_func in tests:
+            print(f"\n{'='*20} {test_name} {'='*20}")
+            try:
+                success = test_func(conn)
+                if success:
+                    passed += 1
+                    print(f"✅ {test_name}: PASSED")
+                else:
+                    print(f"❌ {test_name}: FAILED")
+            except Exception as e:
+                print(f"❌ {test_name}: FAILED - {e}")
+    finally:
+        conn.close()
     
     print(f"\n{'='*60}")
     print(f"🎯 Database Test Results: {passed}/{total} tests passed")
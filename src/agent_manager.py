@@ -8,32 +8,176 @@ This module provides a centralized agent manager that:
 - Reduces agent initialization overhead
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
-from functools import lru_cache
-from agents import create_router_agent, create_sql_agent, create_chart_agent
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, Iterator, List, Optional
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Semantic route caching is optional
+    SentenceTransformer = None
+
+
+class _SemanticRouteCache:
+    """
+    Route cache matching new questions to previously routed ones by embedding similarity.
+    
+    Only active when sentence-transformers is installed; otherwise every
+    method is a cheap no-op and routing relies on the exact-match cache.
+    """
+    
+    __slots__ = ('_model', '_model_lock', '_lock', '_vectors', '_routes', '_max_size', '_threshold')
+    
+    MODEL_NAME = "all-MiniLM-L6-v2"
+    
+    def __init__(self, max_size: int, threshold: float = 0.92) -> None:
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._routes: List[str] = []
+        self._max_size = max_size
+        self._threshold = threshold
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the embedding model is available."""
+        return SentenceTransformer is not None
+    
+    def embed(self, question: str) -> Optional[Any]:
+        """
+        Embed a normalized question, loading the model on first use.
+        
+        Args:
+            question: Normalized question text
+            
+        Returns:
+            Unit-length embedding vector, or None if semantic caching is unavailable
+        """
+        if not self.enabled:
+            return None
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logging.info(f"Loading sentence embedding model {self.MODEL_NAME}")
+                    self._model = SentenceTransformer(self.MODEL_NAME)
+        return self._model.encode(question, normalize_embeddings=True)
+    
+    def lookup(self, vector: Optional[Any]) -> Optional[str]:
+        """
+        Find the route of the most similar cached question.
+        
+        Args:
+            vector: Embedding from embed()
+            
+        Returns:
+            Cached route if the best cosine similarity reaches the threshold, else None
+        """
+        if vector is None or self._vectors is None:
+            return None
+        with self._lock:
+            similarities = self._vectors @ vector
+            best = int(similarities.argmax())
+            if similarities[best] >= self._threshold:
+                return self._routes[best]
+        return None
+    
+    def add(self, vector: Optional[Any], route: str) -> None:
+        """
+        Remember the route for an embedded question, dropping the oldest entry when full.
+        
+        Args:
+            vector: Embedding from embed()
+            route: Routing decision
+        """
+        if vector is None:
+            return
+        with self._lock:
+            row = vector[np.newaxis, :]
+            self._vectors = row if self._vectors is None else np.vstack((self._vectors, row))
+            self._routes.append(route)
+            if len(self._routes) > self._max_size:
+                self._vectors = self._vectors[1:]
+                del self._routes[0]
+    
+    def clear(self) -> None:
+        """Forget all cached routes."""
+        with self._lock:
+            self._vectors = None
+            self._routes.clear()
 
 
 class AgentManager:
     """
-    Singleton agent manager with instance caching and lazy loading.
+    Agent manager with instance caching and lazy loading.
+    
+    Use the module-level ``agent_manager`` instance; constructing another
+    AgentManager creates an independent cache.
     """
     
-    _instance: Optional['AgentManager'] = None
-    _agents: Dict[str, Any] = {}
+    __slots__ = ('_agents', '_agent_locks', '_lock', '_schema_cache', '_warmup', '_route_cache', '_semantic_routes', '_sql_cache')
+    
+    # Maximum number of prompt-bound agent variants kept in memory
+    _SCHEMA_CACHE_MAX = 16
+    
+    # Maximum number of routing decisions remembered for repeated questions
+    _ROUTE_CACHE_MAX = 512
     
-    def __new__(cls) -> 'AgentManager':
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
-        return cls._instance
+    # Maximum number of generated SQL queries remembered per (question, schema)
+    _SQL_CACHE_MAX = 512
     
-    def _initialize(self) -> None:
+    # Questions containing one of these whole words are routed to the chart agent without an LLM call
+    _CHART_KEYWORDS = re.compile(r"\b(chart|plot|graph|visuali[sz]e|histogram)\b")
+    
+    def __init__(self) -> None:
         """Initialize the agent manager."""
-        self._agents = {}
+        self._agents: Dict[str, Any] = {}
+        # One lock per agent so the agents are built in parallel; _lock guards the
+        # caches only, so lookups never wait behind LLM client construction
+        self._agent_locks = {name: threading.Lock() for name in ('router', 'sql', 'chart')}
+        self._lock = threading.Lock()
+        self._schema_cache: Dict[tuple, Any] = {}
+        self._route_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._semantic_routes = _SemanticRouteCache(self._ROUTE_CACHE_MAX)
+        self._sql_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._warmup: List[Any] = []
         logging.info("Agent manager initialized")
     
-    @lru_cache(maxsize=1)
+    def warmup(self) -> None:
+        """
+        Start building all agents in the background so the first question finds
+        them cached. Calling it again while a prewarm exists does nothing.
+        """
+        with self._lock:
+            if self._warmup:
+                return
+            executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="agent-warmup")
+            self._warmup = [
+                executor.submit(getter)
+                for getter in (self.get_router_agent, self.get_sql_agent, self.get_chart_agent)
+            ]
+            executor.shutdown(wait=False)
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background agent prewarm to finish, starting it if needed.
+        
+        Args:
+            timeout: Maximum number of seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if all agents were prewarmed successfully
+        """
+        self.warmup()
+        done, not_done = wait(self._warmup, timeout=timeout)
+        return not not_done and all(future.exception() is None for future in done)
+    
     def get_router_agent(self) -> Any:
         """
         Get or create the router agent with caching.
@@ -41,12 +185,16 @@ class AgentManager:
         Returns:
             Router agent instance
         """
-        if 'router' not in self._agents:
-            logging.info("Creating new router agent instance")
-            self._agents['router'] = create_router_agent()
-        return self._agents['router']
+        agent = self._agents.get('router')
+        if agent is None:
+            with self._agent_locks['router']:
+                agent = self._agents.get('router')
+                if agent is None:
+                    from agents import create_router_agent
+                    logging.info("Creating new router agent instance")
+                    agent = self._agents['router'] = create_router_agent()
+        return agent
     
-    @lru_cache(maxsize=1)
     def get_sql_agent(self) -> Any:
         """
         Get or create the SQL agent with caching.
@@ -54,12 +202,16 @@ class AgentManager:
         Returns:
             SQL agent instance
         """
-        if 'sql' not in self._agents:
-            logging.info("Creating new SQL agent instance")
-            self._agents['sql'] = create_sql_agent()
-        return self._agents['sql']
+        agent = self._agents.get('sql')
+        if agent is None:
+            with self._agent_locks['sql']:
+                agent = self._agents.get('sql')
+                if agent is None:
+                    from agents import create_sql_agent
+                    logging.info("Creating new SQL agent instance")
+                    agent = self._agents['sql'] = create_sql_agent()
+        return agent
     
-    @lru_cache(maxsize=1)
     def get_chart_agent(self) -> Any:
         """
         Get or create the chart agent with caching.
@@ -67,10 +219,75 @@ class AgentManager:
         Returns:
             Chart agent instance
         """
-        if 'chart' not in self._agents:
-            logging.info("Creating new chart agent instance")
-            self._agents['chart'] = create_chart_agent()
-        return self._agents['chart']
+        agent = self._agents.get('chart')
+        if agent is None:
+            with self._agent_locks['chart']:
+                agent = self._agents.get('chart')
+                if agent is None:
+                    from agents import create_chart_agent
+                    logging.info("Creating new chart agent instance")
+                    agent = self._agents['chart'] = create_chart_agent()
+        return agent
+    
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """Normalize a question for cache lookups (lowercase, collapsed whitespace)."""
+        return " ".join(question.lower().split())
+    
+    def _lookup_route(self, key: str, vector: Optional[Any] = None) -> Optional[str]:
+        """
+        Answer a routing decision without calling the LLM, if possible.
+        
+        Args:
+            key: Normalized question
+            vector: Embedding of the question for the semantic cache, if available
+            
+        Returns:
+            Cached or keyword-derived route, or None if the router agent is needed
+        """
+        cached = self._route_cache.get(key)
+        if cached:
+            with self._lock:
+                if key in self._route_cache:
+                    self._route_cache.move_to_end(key)
+            return cached
+        
+        if self._CHART_KEYWORDS.search(key):
+            logging.info("Question routed to: chart (keyword match)")
+            return "chart"
+        
+        similar = self._semantic_routes.lookup(vector)
+        if similar:
+            logging.info(f"Question routed to: {similar} (similar question cached)")
+        return similar
+    
+    def _store_route(self, key: str, route: str, vector: Optional[Any] = None) -> str:
+        """
+        Validate the router agent's answer and remember it for the question.
+        
+        Args:
+            key: Normalized question
+            route: Raw router agent output
+            vector: Embedding of the question for the semantic cache, if available
+            
+        Returns:
+            Routing decision ('sql' or 'chart')
+        """
+        route_clean = route.strip().lower()
+        
+        # Validate route
+        valid_routes = ["sql", "chart"]
+        if route_clean not in valid_routes:
+            logging.warning(f"Invalid route '{route_clean}' received, defaulting to 'sql'")
+            route_clean = "sql"
+            
+        logging.info(f"Question routed to: {route_clean}")
+        with self._lock:
+            self._route_cache[key] = route_clean
+            if len(self._route_cache) > self._ROUTE_CACHE_MAX:
+                self._route_cache.popitem(last=False)
+        self._semantic_routes.add(vector, route_clean)
+        return route_clean
     
     def route_question(self, question: str) -> str:
         """
@@ -82,25 +299,143 @@ class AgentManager:
         Returns:
             Routing decision ('sql' or 'chart')
         """
+        key = self._normalize_question(question)
+        route = self._lookup_route(key)
+        if route:
+            return route
+        
         try:
+            vector = self._semantic_routes.embed(key)
+            route = self._lookup_route(key, vector)
+            if route:
+                return route
+            
             logging.info(f"Routing question: {question[:50]}...")
             router = self.get_router_agent()
-            route = router.invoke({"question": question})
-            route_clean = route.strip().lower()
-            
-            # Validate route
-            valid_routes = ["sql", "chart"]
-            if route_clean not in valid_routes:
-                logging.warning(f"Invalid route '{route_clean}' received, defaulting to 'sql'")
-                route_clean = "sql"
-                
-            logging.info(f"Question routed to: {route_clean}")
-            return route_clean
+            return self._store_route(key, router.invoke({"question": question}), vector)
+            
+        except Exception as e:
+            logging.error(f"Error during question routing: {e}")
+            return "sql"  # Default to SQL on error
+    
+    async def aroute_question(self, question: str) -> str:
+        """
+        Asynchronously route a question using the cached router agent.
+        
+        Args:
+            question: User question to route
+            
+        Returns:
+            Routing decision ('sql' or 'chart')
+        """
+        key = self._normalize_question(question)
+        route = self._lookup_route(key)
+        if route:
+            return route
+        
+        try:
+            loop = asyncio.get_running_loop()
+            vector = await loop.run_in_executor(None, self._semantic_routes.embed, key)
+            route = self._lookup_route(key, vector)
+            if route:
+                return route
+            
+            logging.info(f"Routing question: {question[:50]}...")
+            router = self.get_router_agent()
+            return self._store_route(key, await router.ainvoke({"question": question}), vector)
             
         except Exception as e:
             logging.error(f"Error during question routing: {e}")
             return "sql"  # Default to SQL on error
     
+    def _get_bound_agent(self, name: str, agent: Any, **values: str) -> Any:
+        """
+        Get an agent whose prompt has the given variables pre-applied.
+        
+        Bound variants are cached so repeated calls with the same schema only
+        vary the question portion of the prompt. Only bind values that repeat
+        across calls; per-call values such as chart data belong in the input.
+        
+        Args:
+            name: Agent name used in the cache key
+            agent: Agent chain (prompt | llm | parser)
+            **values: Prompt variables to bind
+            
+        Returns:
+            Agent chain expecting only the remaining prompt variables
+        """
+        key = (name, *values.items())
+        bound = self._schema_cache.get(key)
+        if bound is None:
+            prompt, *rest = agent.steps
+            bound = prompt.partial(**values).pipe(*rest)
+            with self._lock:
+                if len(self._schema_cache) >= self._SCHEMA_CACHE_MAX:
+                    self._schema_cache.pop(next(iter(self._schema_cache)))
+                self._schema_cache[key] = bound
+        return bound
+    
+    def stream_sql_query(self, question: str, schema: str) -> Iterator[str]:
+        """
+        Stream SQL query tokens from the cached SQL agent as they are generated.
+        
+        Args:
+            question: User question
+            schema: Database schema
+            
+        Yields:
+            Chunks of the generated SQL query
+        """
+        sql_agent = self._get_bound_agent("sql", self.get_sql_agent(), schema=schema)
+        yield from sql_agent.stream({"question": question})
+    
+    def stream_chart_code(self, question: str, data: str) -> Iterator[str]:
+        """
+        Stream chart code from the cached chart agent as it is generated.
+        
+        Args:
+            question: User question
+            data: Data for visualization
+            
+        Yields:
+            Chunks of the generated Python chart code
+        """
+        # Query results differ on every call, so they are passed in rather than bound
+        yield from self.get_chart_agent().stream({"question": question, "data": data})
+    
+    def _sql_cache_key(self, question: str, schema: str) -> tuple:
+        """Build the SQL cache key from the normalized question and a schema digest."""
+        schema_hash = hashlib.blake2b(schema.encode(), digest_size=8).hexdigest()
+        return (self._normalize_question(question), schema_hash)
+    
+    def _get_cached_sql(self, key: tuple) -> Optional[str]:
+        """Return previously generated SQL for the key, marking it recently used."""
+        query = self._sql_cache.get(key)
+        if query:
+            with self._lock:
+                if key in self._sql_cache:
+                    self._sql_cache.move_to_end(key)
+            logging.info("Reusing cached SQL query for repeated question")
+        return query
+    
+    def cache_sql_query(self, question: str, schema: str, query: str) -> None:
+        """
+        Remember SQL for a question once it has executed successfully.
+        
+        Generation does not cache on its own, so a query that fails against the
+        database is regenerated next time instead of being replayed.
+        
+        Args:
+            question: User question
+            schema: Database schema
+            query: SQL query that ran without error
+        """
+        key = self._sql_cache_key(question, schema)
+        with self._lock:
+            self._sql_cache[key] = query
+            if len(self._sql_cache) > self._SQL_CACHE_MAX:
+                self._sql_cache.popitem(last=False)
+    
     def generate_sql_query(self, question: str, schema: str) -> str:
         """
         Generate SQL query using the cached SQL agent.
@@ -112,13 +447,14 @@ class AgentManager:
         Returns:
             Generated SQL query
         """
+        key = self._sql_cache_key(question, schema)
+        cached = self._get_cached_sql(key)
+        if cached:
+            return cached
+        
         try:
             logging.info("Generating SQL query using SQL agent")
-            sql_agent = self.get_sql_agent()
-            query = sql_agent.invoke({
-                "question": question,
-                "schema": schema
-            })
+            query = "".join(self.stream_sql_query(question, schema))
             
             if not query or not query.strip():
                 raise ValueError("SQL agent returned empty query")
@@ -134,6 +470,62 @@ class AgentManager:
         """
         Generate chart code using the cached chart agent.
         
+        Args:
+            question: User question
+            data: Data for visualization
+            
+        Returns:
+            Generated Python chart code
+        """
+        try:
+            logging.info("Generating chart code using chart agent")
+            chart_code = "".join(self.stream_chart_code(question, data))
+            
+            if not chart_code or not chart_code.strip():
+                raise ValueError("Chart agent returned empty code")
+                
+            logging.info("Chart code generated successfully")
+            return chart_code.strip()
+            
+        except Exception as e:
+            logging.error(f"Error generating chart code: {e}")
+            raise
+    
+    async def agenerate_sql_query(self, question: str, schema: str) -> str:
+        """
+        Asynchronously generate a SQL query using the cached SQL agent.
+        
+        Args:
+            question: User question
+            schema: Database schema
+            
+        Returns:
+            Generated SQL query
+        """
+        key = self._sql_cache_key(question, schema)
+        cached = self._get_cached_sql(key)
+        if cached:
+            return cached
+        
+        try:
+            logging.info("Generating SQL query using SQL agent")
+            sql_agent = self._get_bound_agent("sql", self.get_sql_agent(), schema=schema)
+            query = "".join([chunk async for chunk in sql_agent.astream({"question": question})])
+            
+            if not query or not query.strip():
+                raise ValueError("SQL agent returned empty query")
+                
+            logging.info(f"Generated SQL query: {query[:100]}...")
+            return query.strip()
+            
+        except Exception as e:
+            logging.error(f"Error generating SQL query: {e}")
+            raise
+    
+    async def agenerate_chart_code(self, question: str, data: str) -> str:
+        """
+        Asynchronously generate chart code using the cached chart agent.
+        
         Args:
             question: User question
             data: Data for visualization
@@ -144,10 +536,7 @@ class AgentManager:
         try:
             logging.info("Generating chart code using chart agent")
             chart_agent = self.get_chart_agent()
-            chart_code = chart_agent.invoke({
-                "question": question,
-                "data": data
-            })
+            chart_code = "".join([chunk async for chunk in chart_agent.astream({"question": question, "data": data})])
             
             if not chart_code or not chart_code.strip():
                 raise ValueError("Chart agent returned empty code")
@@ -159,16 +548,24 @@ class AgentManager:
             logging.error(f"Error generating chart code: {e}")
             raise
     
+    def warm_route_cache(self) -> None:
+        """
+        Load the embedding model used by the semantic route cache, if installed,
+        so the first routed question does not pay the model load.
+        """
+        self._semantic_routes.embed("warmup")
+    
     def clear_cache(self) -> None:
         """
         Clear all cached agents (useful for testing or memory management).
         """
         logging.info("Clearing agent cache")
-        self._agents.clear()
-        # Clear LRU cache
-        self.get_router_agent.cache_clear()
-        self.get_sql_agent.cache_clear()
-        self.get_chart_agent.cache_clear()
+        with self._lock:
+            self._agents.clear()
+            self._schema_cache.clear()
+            self._route_cache.clear()
+            self._sql_cache.clear()
+        self._semantic_routes.clear()
     
     def get_cache_info(self) -> Dict[str, Any]:
         """
@@ -179,9 +576,7 @@ class AgentManager:
         """
         return {
             "cached_agents": list(self._agents.keys()),
-            "router_cache_info": self.get_router_agent.cache_info(),
-            "sql_cache_info": self.get_sql_agent.cache_info(),
-            "chart_cache_info": self.get_chart_agent.cache_info()
+            "cache_size": len(self._agents)
         }
     
     def health_check(self) -> Dict[str, Any]:
@@ -224,5 +619,5 @@ class AgentManager:
         return self.get_chart_agent()
 
 
-# Global instance
+# Canonical shared instance
 agent_manager = AgentManager()
@@ -1,12 +1,13 @@
 import logging
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from config import llm
 
 def create_chart_agent():
     """
     Creates an agent that can generate code to create a chart.
     """
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+    from config import llm
+
     logging.info("Creating chart agent")
     
     system_prompt = (
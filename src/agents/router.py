@@ -1,12 +1,13 @@
 import logging
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
-from config import llm
 
 def create_router_agent():
     """
     Creates a router agent that determines which specialist agent to use.
     """
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+    from config import llm
+
     logging.info("Creating router agent")
     
     system_prompt = (
@@ -1,12 +1,13 @@
 import logging
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from config import llm
 
 def create_sql_agent():
     """
     Creates an agent that can query a SQL database.
     """
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+    from config import llm
+
     logging.info("Creating SQL agent")
     
     system_prompt = (
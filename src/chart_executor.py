@@ -3,10 +3,22 @@ Chart execution module for safe code execution and file management.
 """
 
 import os
+import re
+import time
+import types
+import hashlib
 import logging
 import tempfile
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
 from config import CHART_OUTPUT_DIR
 
 class ChartExecutor:
@@ -14,11 +26,31 @@ class ChartExecutor:
     Handles safe execution of chart generation code with file management.
     """
     
+    # Matches plt.show() including whitespace and arguments like block=False
+    _SHOW_RE = re.compile(r"plt\.show\s*\([^)]*\)")
+    # Kept on one line so an indented plt.show() stays valid after substitution
+    _SAVE_CODE = "plt.savefig(CHART_PATH, dpi=300, bbox_inches='tight'); plt.close()"
+    # Maximum number of compiled chart programs kept in memory
+    _CODE_CACHE_MAX = 64
+    
     def __init__(self, output_dir: str = None):
         """Initialize chart executor with output directory."""
         self.output_dir = Path(output_dir or CHART_OUTPUT_DIR)
         self.output_dir.mkdir(exist_ok=True)
         
+        # Compiled chart code keyed by a digest of the source, least recently used first
+        self._code_cache: "OrderedDict[bytes, types.CodeType]" = OrderedDict()
+        self._code_lock = threading.Lock()
+        
+        # Plotting libraries are bound up front so chart code doesn't pay for them
+        self._globals_template = {
+            '__builtins__': __builtins__,
+            'plt': plt,
+            'sns': sns,
+            'pd': pd,
+            'np': np
+        }
+        
     def execute_chart_code(self, chart_code: str, data: Any) -> Dict[str, Any]:
         """
         Safely execute chart generation code.
@@ -31,24 +63,20 @@ class ChartExecutor:
             Dict with execution results and chart path
         """
         try:
-            # Create a safe execution environment
-            exec_globals = {
-                '__builtins__': __builtins__,
-                'data': data,
-                'plt': None,  # Will be imported in code
-                'sns': None,  # Will be imported in code
-                'pd': None,   # Will be imported in code
-                'np': None    # Will be imported in code
-            }
-            
             # Modify chart code to save to specific location
-            modified_code = self._modify_chart_code(chart_code)
+            modified_code, chart_path = self._modify_chart_code(chart_code)
+            code_obj = self._compile_chart_code(modified_code)
             
             # Execute the chart code
-            exec(modified_code, exec_globals)
+            exec(code_obj, {
+                **self._globals_template,
+                'data': data,
+                'CHART_PATH': str(chart_path)
+            })
             
-            # Find the generated chart file
-            chart_path = self._find_latest_chart()
+            # Fall back to a directory scan if the code saved elsewhere
+            if not chart_path.exists():
+                chart_path = self._find_latest_chart()
             
             return {
                 "success": True,
@@ -64,27 +92,48 @@ class ChartExecutor:
                 "chart_path": None
             }
     
-    def _modify_chart_code(self, code: str) -> str:
+    def _compile_chart_code(self, code: str) -> types.CodeType:
+        """
+        Compile chart code, reusing the code object for repeated sources.
+        """
+        key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+        with self._code_lock:
+            code_obj = self._code_cache.get(key)
+            if code_obj is not None:
+                self._code_cache.move_to_end(key)
+                return code_obj
+        
+        code_obj = compile(code, f"<chart_{key.hex()[:8]}>", "exec")
+        with self._code_lock:
+            self._code_cache[key] = code_obj
+            if len(self._code_cache) > self._CODE_CACHE_MAX:
+                self._code_cache.popitem(last=False)
+        return code_obj
+    
+    def _modify_chart_code(self, code: str) -> Tuple[str, Path]:
         """
         Modify chart code to save to output directory instead of showing.
+        
+        The output path is read from the CHART_PATH global at execution time,
+        so the modified code is identical across runs and can be cached.
+        
+        Returns:
+            Tuple of (modified code, path the chart will be saved to)
         """
-        # Replace plt.show() with plt.savefig()
-        chart_filename = f"chart_{int(time.time())}.png"
-        chart_path = self.output_dir / chart_filename
+        # Nanosecond timestamps keep charts generated in the same second apart
+        chart_path = self.output_dir / f"chart_{time.time_ns()}.png"
         
-        modified_code = code.replace(
-            "plt.show()",
-            f"plt.savefig('{chart_path}', dpi=300, bbox_inches='tight')\nplt.close()"
-        )
+        # Replace plt.show() with plt.savefig()
+        modified_code, replaced = self._SHOW_RE.subn(self._SAVE_CODE, code)
         
         # Add fallback if no plt.show() found
-        if "plt.show()" not in code and "plt.savefig(" not in code:
-            modified_code += f"\nplt.savefig('{chart_path}', dpi=300, bbox_inches='tight')\nplt.close()"
+        if replaced == 0 and "plt.savefig(" not in code:
+            modified_code += "\n" + self._SAVE_CODE
             
-        return modified_code
+        return modified_code, chart_path
     
     def _find_latest_chart(self) -> Optional[Path]:
-        """Find the most recently created chart file."""
+        """Find the most recently created chart file (fallback only)."""
         chart_files = list(self.output_dir.glob("*.png"))
         if chart_files:
             return max(chart_files, key=lambda f: f.stat().st_mtime)
@@ -92,19 +141,21 @@ class ChartExecutor:
     
     def cleanup_old_charts(self, keep_latest: int = 5):
         """Clean up old chart files, keeping only the most recent ones."""
-        chart_files = sorted(
-            self.output_dir.glob("*.png"),
-            key=lambda f: f.stat().st_mtime,
-            reverse=True
-        )
+        # DirEntry caches its stat result, so each file is only stat'ed once
+        with os.scandir(self.output_dir) as entries:
+            chart_files = sorted(
+                (entry for entry in entries if entry.name.endswith(".png") and entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime,
+                reverse=True
+            )
         
         # Remove old files beyond the keep_latest count
         for old_file in chart_files[keep_latest:]:
             try:
-                old_file.unlink()
-                logging.info(f"Cleaned up old chart: {old_file}")
+                os.remove(old_file.path)
+                logging.info(f"Cleaned up old chart: {old_file.path}")
             except Exception as e:
-                logging.warning(f"Could not delete old chart {old_file}: {e}")
+                logging.warning(f"Could not delete old chart {old_file.path}: {e}")
 
 # Global instance
 chart_executor = ChartExecutor()
@@ -1,7 +1,8 @@
 # --- Configuration ---
 import os
 import logging
-from langchain_ollama.chat_models import ChatOllama
+import functools
+import threading
 
 # Get the absolute path of the project's root directory
 # This assumes the script is in the 'src' directory.
@@ -16,6 +17,24 @@ LOG_FILE = os.path.join(PROJECT_ROOT, "logs", "project.log")
 CSV_FILE = os.path.join(PROJECT_ROOT, "data", "sales_data.csv")
 CHART_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data")
 
+@functools.lru_cache(maxsize=None)
+def _dir_entries(directory):
+    """
+    List a directory's entry names with a single scandir call.
+    
+    Results are cached so repeated existence checks are answered from memory;
+    call ``_dir_entries.cache_clear()`` after creating files or directories.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+def _path_exists(path):
+    """Check whether a path exists using the cached parent directory listing."""
+    return os.path.basename(path) in _dir_entries(os.path.dirname(path))
+
 # Configuration validation
 def validate_configuration():
     """
@@ -31,13 +50,16 @@ def validate_configuration():
     ]
     
     for dir_path in required_dirs:
+        if _path_exists(dir_path):
+            continue
         try:
             os.makedirs(dir_path, exist_ok=True)
+            _dir_entries.cache_clear()
         except Exception as e:
             issues.append(f"Cannot create directory {dir_path}: {e}")
     
     # Check if CSV file exists (needed for database creation)
-    if not os.path.exists(CSV_FILE):
+    if not _path_exists(CSV_FILE):
         issues.append(f"Source CSV file not found: {CSV_FILE}")
     
     # Validate model name
@@ -54,26 +76,75 @@ def validate_configuration():
     return True
 
 # --- LLM Initialization with error handling ---
-try:
-    llm = ChatOllama(model=MODEL)
-    logging.info(f"LLM initialized successfully with model: {MODEL}")
-except Exception as e:
-    logging.error(f"Failed to initialize LLM with model {MODEL}: {e}")
-    raise Exception(f"LLM initialization failed: {e}")
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm():
+    """
+    Create the chat model on first use.
+    
+    The LangChain/Ollama import is deferred so scripts that only need paths
+    (database creation, validation, tests) don't pay for it. Construction is
+    locked so agents created in parallel all share a single client.
+    """
+    global _llm
+    if _llm is not None:
+        return _llm
+    
+    with _llm_lock:
+        if _llm is None:
+            from langchain_ollama.chat_models import ChatOllama
+            
+            try:
+                _llm = ChatOllama(model=MODEL)
+                logging.info(f"LLM initialized successfully with model: {MODEL}")
+            except Exception as e:
+                logging.error(f"Failed to initialize LLM with model {MODEL}: {e}")
+                raise Exception(f"LLM initialization failed: {e}")
+    return _llm
+
+def __getattr__(name):
+    """Resolve ``config.llm`` and ``config.CONFIG_SUMMARY`` lazily so existing imports keep working."""
+    if name == "llm":
+        return get_llm()
+    if name == "CONFIG_SUMMARY":
+        return get_config_summary()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Validate configuration on import
 if not validate_configuration():
     logging.warning("Configuration validation failed - some features may not work correctly")
 
-# Export configuration summary for debugging
-CONFIG_SUMMARY = {
-    "model": MODEL,
-    "project_root": PROJECT_ROOT,
-    "db_file": DB_FILE,
-    "log_file": LOG_FILE,
-    "csv_file": CSV_FILE,
-    "db_exists": os.path.exists(DB_FILE),
-    "csv_exists": os.path.exists(CSV_FILE)
-}
+# Configuration summary for debugging, built on first use
+@functools.lru_cache(maxsize=1)
+def get_config_summary():
+    """
+    Build the configuration summary shared by config and ConfigValidator.
+    
+    Returns:
+        Dict with the configured paths and whether they exist
+    """
+    return {
+        "model": MODEL,
+        "project_root": PROJECT_ROOT,
+        "db_file": DB_FILE,
+        "log_file": LOG_FILE,
+        "csv_file": CSV_FILE,
+        "db_exists": _path_exists(DB_FILE),
+        "csv_exists": _path_exists(CSV_FILE),
+        "logs_dir_exists": _path_exists(os.path.dirname(LOG_FILE))
+    }
+
+def refresh_config_summary():
+    """
+    Drop cached directory listings and rebuild the configuration summary.
+    
+    Returns:
+        Freshly built configuration summary
+    """
+    _dir_entries.cache_clear()
+    get_config_summary.cache_clear()
+    return get_config_summary()
 
-logging.info(f"Configuration loaded: {CONFIG_SUMMARY}")
+if logging.getLogger().isEnabledFor(logging.INFO):
+    logging.info(f"Configuration loaded: {get_config_summary()}")
@@ -1,33 +1,141 @@
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 import os
+import re
+import sys
+import logging
 from src.config import DB_FILE, CSV_FILE
 
+# Rows read from the CSV and written to SQLite per batch
+CHUNK_SIZE = 50_000
+
+# Connection settings used while bulk loading, and the ones restored afterwards
+LOAD_PRAGMAS = ("PRAGMA journal_mode=MEMORY", "PRAGMA synchronous=OFF", "PRAGMA temp_store=MEMORY")
+# The new file keeps a rollback journal until it has been moved into place
+SERVE_PRAGMAS = ("PRAGMA synchronous=NORMAL", "PRAGMA journal_mode=DELETE")
+
+# Columns whose names contain one of these words are likely filter/group-by keys
+INDEX_HINTS = ("date", "id", "product", "region", "category", "customer")
+
+def create_sales_indexes(conn):
+    """
+    Index the columns of the 'sales' table that generated queries are likely to filter on.
+    
+    Args:
+        conn: Open SQLAlchemy connection
+        
+    Returns:
+        List of indexed column names
+    """
+    indexed = []
+    for column in conn.exec_driver_sql("PRAGMA table_info(sales)").fetchall():
+        name = column[1]
+        if any(hint in name.lower() for hint in INDEX_HINTS):
+            index_name = "idx_sales_" + re.sub(r"\W+", "_", name.lower())
+            quoted = '"' + name.replace('"', '""') + '"'
+            conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {index_name} ON sales({quoted})")
+            indexed.append(name)
+    return indexed
+
+def _release_database(db_file):
+    """
+    Detach an existing database so a new file can be moved over it.
+    
+    Any engine this process already opened on it is disposed, the old WAL is
+    checkpointed into the file, and the -wal/-shm sidecars are removed so they
+    can't be replayed onto the replacement. Other processes using the database
+    (e.g. a running app) must be stopped first.
+    
+    Args:
+        db_file: Path of the database being replaced
+    """
+    for module_name in ("database_manager", "src.database_manager"):
+        module = sys.modules.get(module_name)
+        manager = getattr(module, "db_manager", None)
+        if manager is not None and manager._engine is not None:
+            manager._engine.dispose()
+    
+    old_engine = create_engine(f"sqlite:///{db_file}")
+    try:
+        with old_engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        old_engine.dispose()
+    
+    for suffix in ("-wal", "-shm"):
+        try:
+            os.remove(db_file + suffix)
+        except FileNotFoundError:
+            pass
+
 def create_db_from_csv():
     """
     Creates a SQLite database from a CSV file.
+    
+    The database is built in a temporary file next to DB_FILE and moved into
+    place with an atomic rename, so an interrupted run leaves any existing
+    database untouched.
     """
-    if os.path.exists(DB_FILE):
-        print(f"Database '{DB_FILE}' already exists. Deleting and recreating.")
-        os.remove(DB_FILE)
-        
     # Ensure the data directory exists
     os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+    
+    tmp_file = DB_FILE + ".tmp"
+    for leftover in (tmp_file, tmp_file + "-journal", tmp_file + "-wal", tmp_file + "-shm"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
 
-    print(f"Reading data from '{CSV_FILE}'...")
-    df = pd.read_csv(CSV_FILE)
+    logging.info(f"Creating database engine for '{tmp_file}'...")
+    engine = create_engine(f"sqlite:///{tmp_file}")
     
-    print(f"Creating database engine for '{DB_FILE}'...")
-    engine = create_engine(f"sqlite:///{DB_FILE}")
+    try:
+        with engine.connect() as conn:
+            # The file is built from scratch, so durability can be relaxed during the load
+            for pragma in LOAD_PRAGMAS:
+                conn.exec_driver_sql(pragma)
+            conn.commit()
+            
+            logging.info(f"Streaming data from '{CSV_FILE}' into 'sales' table...")
+            with conn.begin():
+                first = True
+                for chunk in pd.read_csv(CSV_FILE, chunksize=CHUNK_SIZE):
+                    chunk.to_sql("sales", conn, if_exists="replace" if first else "append", index=False)
+                    first = False
+                
+                indexed = create_sales_indexes(conn)
+                logging.info(f"Indexed columns: {', '.join(indexed) or 'none'}")
+            
+            # Restore normal settings for the application's connections
+            for pragma in SERVE_PRAGMAS:
+                conn.exec_driver_sql(pragma)
+            conn.commit()
+        
+        # Record table statistics so schema lookups can read row counts without a full scan
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    finally:
+        # Closing every connection checkpoints the WAL back into the file
+        engine.dispose()
     
-    print("Writing data to 'sales' table...")
-    df.to_sql("sales", engine, index=False)
+    if os.path.exists(DB_FILE):
+        logging.info(f"Database '{DB_FILE}' already exists. Replacing it.")
+        _release_database(DB_FILE)
+    os.replace(tmp_file, DB_FILE)
+    
+    # Only switch to WAL once the file is in place, so its -wal/-shm belong to it
+    engine = create_engine(f"sqlite:///{DB_FILE}")
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    finally:
+        engine.dispose()
     
-    print("Database creation complete.")
-    return engine
+    logging.info("Database creation complete.")
+    return create_engine(f"sqlite:///{DB_FILE}")
 
 if __name__ == "__main__":
     # To run this script, you must be in the root directory of the project
     # and execute it as a module: python -m src.create_database
+    # Importing config already configured the root logger, so replace its handlers
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
     create_db_from_csv()
-    print(f"Database '{DB_FILE}' created successfully from '{CSV_FILE}'.")
+    logging.info(f"Database '{DB_FILE}' created successfully from '{CSV_FILE}'.")
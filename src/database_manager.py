@@ -8,50 +8,123 @@ This module provides a centralized database connection manager that:
 - Reduces database connection overhead
 """
 
+import asyncio
 import logging
 import os
 from contextlib import contextmanager
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.pool import StaticPool
-from typing import Generator, Optional, Any, Dict, List
+from sqlalchemy.pool import QueuePool
+from typing import Generator, Iterator, Optional, Any, Dict, List, Tuple, TYPE_CHECKING
 from config import DB_FILE
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class DatabaseManager:
     """
-    Singleton database manager with connection pooling and health checks.
+    Database manager with connection pooling and health checks.
+    
+    Use the module-level ``db_manager`` instance (or ``get_db_manager()``);
+    constructing another DatabaseManager creates a separate engine and pool.
     """
     
-    _instance: Optional['DatabaseManager'] = None
     _engine = None
     
-    def __new__(cls) -> 'DatabaseManager':
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
-        return cls._instance
+    # Statements that can change the schema or row counts reported by get_schema()
+    _WRITE_KEYWORDS = frozenset({"INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER", "REPLACE"})
+    
+    # Per-connection settings applied to every pooled connection
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-65536",      # 64 MB page cache
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+    )
+    
+    # Static statements, built once instead of on every call
+    _SQL_HEALTH = text("SELECT 1")
+    _SQL_COLUMNS = text(
+        'SELECT m.name, p.name, p.type, p."notnull", p.pk '
+        "FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+        "WHERE m.type='table' AND m.name NOT LIKE 'sqlite_%' "
+        "ORDER BY m.rowid, p.cid;"
+    )
+    _SQL_HAS_STAT1 = text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1';")
+    _SQL_STAT1 = text("SELECT tbl, stat FROM sqlite_stat1;")
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        raise TypeError("DatabaseManager cannot be subclassed; use the shared db_manager instance")
     
-    def _initialize(self) -> None:
+    def __init__(self) -> None:
         """Initialize the database engine with optimized settings."""
+        # (database file key, schema) kept in one attribute so readers always see
+        # a key together with the schema it belongs to
+        self._schema_memo: Optional[Tuple[tuple, Dict[str, Any]]] = None
+        self._db_exists = False
         try:
-            # Create engine with connection pooling for SQLite
+            # Create engine with a real connection pool so readers run concurrently
             self._engine = create_engine(
                 f"sqlite:///{DB_FILE}",
-                poolclass=StaticPool,
-                pool_pre_ping=True,  # Verify connections before use
-                pool_recycle=3600,   # Recycle connections every hour
+                poolclass=QueuePool,
+                pool_size=4,
+                max_overflow=8,
+                # SQLite connections are local file handles that do not go stale, so
+                # pooled connections are kept for the whole session: no per-checkout
+                # ping and no periodic recycling (which would replay the PRAGMAs)
+                pool_pre_ping=False,
+                pool_recycle=-1,
                 connect_args={
                     "check_same_thread": False,  # Allow multi-threading
                     "timeout": 30,  # 30 second timeout
                 },
                 echo=False  # Set to True for SQL debugging
             )
+            event.listen(self._engine, "connect", self._configure_connection)
+            event.listen(self._engine, "close", self._optimize_connection)
+            
+            self._check_database_file()
             logging.info("Database manager initialized with connection pooling")
         except Exception as e:
             logging.error(f"Failed to initialize database manager: {e}")
             raise
     
+    def _check_database_file(self) -> bool:
+        """
+        Check once that the database file exists and prepare it for use.
+        
+        After the file has been found, later calls skip the filesystem check and
+        reuse the pooled connections, which stay valid for the life of the process.
+        
+        Returns:
+            True if the database file exists
+        """
+        if not self._db_exists and os.path.exists(DB_FILE):
+            # WAL is persistent in the database file, so it only needs to be set once
+            with self._engine.connect() as connection:
+                connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+            self._db_exists = True
+        return self._db_exists
+    
+    @classmethod
+    def _configure_connection(cls, dbapi_connection: Any, connection_record: Any) -> None:
+        """Apply the per-connection PRAGMAs to a newly opened SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in cls._CONNECTION_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _optimize_connection(dbapi_connection: Any, connection_record: Any) -> None:
+        """Let SQLite refresh its planner statistics before a connection is closed."""
+        try:
+            dbapi_connection.execute("PRAGMA optimize")
+        except Exception as e:
+            logging.debug(f"PRAGMA optimize on close skipped: {e}")
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Perform a health check on the database connection.
@@ -61,19 +134,50 @@ class DatabaseManager:
         """
         try:
             with self.get_connection() as conn:
-                result = conn.execute(text("SELECT 1"))
-                return {
-                    "status": "healthy",
-                    "message": "Database connection successful",
-                    "tables_accessible": True
-                }
+                conn.execute(self._SQL_HEALTH)
         except Exception as e:
             logging.error(f"Database health check failed: {e}")
+            return self._health_result(e)
+        return self._health_result()
+    
+    @staticmethod
+    def _health_result(error: Optional[Exception] = None) -> Dict[str, Any]:
+        """Build the health check result, unhealthy if an error is given."""
+        if error is None:
             return {
-                "status": "unhealthy", 
-                "message": f"Database connection failed: {str(e)}",
-                "tables_accessible": False
+                "status": "healthy",
+                "message": "Database connection successful",
+                "tables_accessible": True
             }
+        return {
+            "status": "unhealthy", 
+            "message": f"Database connection failed: {str(error)}",
+            "tables_accessible": False
+        }
+    
+    def health_and_schema(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run the health check and read the schema on a single connection.
+        
+        Returns:
+            Tuple of (health check results, schema information) in the same
+            formats as health_check() and get_schema()
+        """
+        key = self._schema_file_key()
+        try:
+            with self.get_connection() as connection:
+                connection.execute(self._SQL_HEALTH)
+                schema = self._cached_schema(key)
+                if schema is None:
+                    try:
+                        schema = self._read_schema(connection, key)
+                    except Exception as e:
+                        logging.error(f"Error getting schema: {e}")
+                        schema = self._schema_error(e)
+        except Exception as e:
+            logging.error(f"Database health check failed: {e}")
+            return self._health_result(e), self._schema_error(e)
+        return self._health_result(), schema
     
     @contextmanager
     def get_connection(self) -> Generator[Any, None, None]:
@@ -83,7 +187,7 @@ class DatabaseManager:
         Yields:
             Connection: SQLAlchemy connection object
         """
-        if not os.path.exists(DB_FILE):
+        if not self._db_exists and not self._check_database_file():
             raise FileNotFoundError(f"Database file not found: {DB_FILE}")
         
         connection = None
@@ -104,69 +208,210 @@ class DatabaseManager:
         Returns:
             Dict containing schema information and metadata
         """
+        # Reuse the last schema while the database file is unchanged
+        key = self._schema_file_key()
+        schema = self._cached_schema(key)
+        if schema is not None:
+            return schema
+        
         try:
             with self.get_connection() as connection:
-                # Get table names
-                result = connection.execute(text("SELECT name FROM sqlite_master WHERE type='table';"))
-                tables = [row[0] for row in result]
-                
-                if not tables:
-                    return {
-                        "tables": [],
-                        "schema_text": "No tables found in database",
-                        "table_count": 0
-                    }
-                
-                # Get detailed schema for each table
-                schema_info = []
-                table_details = {}
-                
-                for table in tables:
-                    # Get column information
-                    result = connection.execute(text(f"PRAGMA table_info({table});"))
-                    columns = result.fetchall()
-                    
-                    # Get row count
-                    count_result = connection.execute(text(f"SELECT COUNT(*) FROM {table};"))
-                    row_count = count_result.scalar()
-                    
-                    schema_info.append(f"Table: {table} ({row_count} rows)")
-                    table_columns = []
-                    
-                    for col in columns:
-                        col_info = f"  - {col[1]} ({col[2]})"
-                        if col[5]:  # Primary key
-                            col_info += " [PRIMARY KEY]"
-                        if col[3]:  # Not null
-                            col_info += " [NOT NULL]"
-                        schema_info.append(col_info)
-                        table_columns.append({
-                            "name": col[1],
-                            "type": col[2],
-                            "nullable": not col[3],
-                            "primary_key": bool(col[5])
-                        })
-                    
-                    table_details[table] = {
-                        "columns": table_columns,
-                        "row_count": row_count
-                    }
-                
-                return {
-                    "tables": tables,
-                    "schema_text": "\n".join(schema_info),
-                    "table_count": len(tables),
-                    "table_details": table_details
-                }
-                
+                return self._read_schema(connection, key)
         except Exception as e:
             logging.error(f"Error getting schema: {e}")
+            return self._schema_error(e)
+    
+    @staticmethod
+    def _schema_error(error: Exception) -> Dict[str, Any]:
+        """Build the schema result reported when the schema cannot be read."""
+        return {
+            "tables": [],
+            "schema_text": f"Error retrieving schema: {error}",
+            "table_count": 0,
+            "error": str(error)
+        }
+    
+    def _read_schema(self, connection: Any, key: Optional[tuple]) -> Dict[str, Any]:
+        """
+        Read the schema over an open connection and memoize it under ``key``.
+        
+        Args:
+            connection: Open SQLAlchemy connection
+            key: Database file key from _schema_file_key()
+            
+        Returns:
+            Dict containing schema information and metadata
+        """
+        # Get every table's columns in one query, skipping SQLite's internal tables
+        result = connection.execute(self._SQL_COLUMNS)
+        columns_by_table: Dict[str, List[Any]] = {}
+        for row in result:
+            columns_by_table.setdefault(row[0], []).append(row)
+        tables = list(columns_by_table)
+        
+        if not tables:
             return {
                 "tables": [],
-                "schema_text": f"Error retrieving schema: {e}",
-                "table_count": 0,
-                "error": str(e)
+                "schema_text": "No tables found in database",
+                "table_count": 0
             }
+        
+        # Approximate row counts recorded by ANALYZE, read in one query
+        row_counts = self._get_analyzed_row_counts(connection)
+        
+        # Count the tables ANALYZE has not covered, all in one statement
+        uncounted = [table for table in tables if table not in row_counts]
+        if uncounted:
+            quoted = ['"' + table.replace('"', '""') + '"' for table in uncounted]
+            count_sql = " UNION ALL ".join(
+                f"SELECT :t{i}, COUNT(*) FROM {name}" for i, name in enumerate(quoted)
+            )
+            params = {f"t{i}": table for i, table in enumerate(uncounted)}
+            row_counts.update(connection.execute(text(count_sql), params).all())
+        
+        # Build detailed schema for each table
+        schema_info = []
+        table_details = {}
+        
+        for table, columns in columns_by_table.items():
+            row_count = row_counts[table]
+            
+            schema_info.append(f"Table: {table} ({row_count} rows)")
+            table_columns = []
+            
+            for _, name, col_type, not_null, pk in columns:
+                col_info = f"  - {name} ({col_type})"
+                if pk:
+                    col_info += " [PRIMARY KEY]"
+                if not_null:
+                    col_info += " [NOT NULL]"
+                schema_info.append(col_info)
+                table_columns.append({
+                    "name": name,
+                    "type": col_type,
+                    "nullable": not not_null,
+                    "primary_key": bool(pk)
+                })
+            
+            table_details[table] = {
+                "columns": table_columns,
+                "row_count": row_count
+            }
+        
+        schema = {
+            "tables": tables,
+            "schema_text": "\n".join(schema_info),
+            "table_count": len(tables),
+            "table_details": table_details
+        }
+        if key is not None:
+            self._schema_memo = (key, schema)
+        return schema
+    
+    def _cached_schema(self, key: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        """
+        Return the memoized schema if it was read for the given file key.
+        
+        Args:
+            key: Current database file key from _schema_file_key()
+            
+        Returns:
+            The memoized schema, or None if there is none for this key
+        """
+        memo = self._schema_memo
+        if key is not None and memo is not None and memo[0] == key:
+            return memo[1]
+        return None
+    
+    @staticmethod
+    def _schema_file_key() -> Optional[tuple]:
+        """
+        Build the cache key identifying the current database file contents.
+        
+        In WAL mode recent writes only touch the -wal file, so its stat is part of the key.
+        
+        Returns:
+            Tuple of modification times and sizes, or None if the database is missing
+        """
+        try:
+            st = os.stat(DB_FILE)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        try:
+            wal = os.stat(DB_FILE + "-wal")
+        except OSError:
+            return key
+        if wal.st_size:
+            key += (wal.st_mtime_ns, wal.st_size)
+        return key
+    
+    def _get_analyzed_row_counts(self, connection: Any) -> Dict[str, int]:
+        """
+        Read per-table row counts from the sqlite_stat1 table maintained by ANALYZE.
+        
+        Args:
+            connection: Open SQLAlchemy connection
+            
+        Returns:
+            Mapping of table name to row count (empty if ANALYZE has never run)
+        """
+        has_stats = connection.execute(self._SQL_HAS_STAT1).first()
+        if not has_stats:
+            return {}
+        
+        row_counts = {}
+        for table, stat in connection.execute(self._SQL_STAT1):
+            # The first integer of every stat entry is the table's row count
+            if stat and table not in row_counts:
+                row_counts[table] = int(stat.split()[0])
+        return row_counts
+    
+    async def aget_schema(self) -> Dict[str, Any]:
+        """
+        Get the database schema without blocking the event loop.
+        
+        Returns:
+            Dict containing schema information and metadata
+        """
+        # The schema rarely changes during a session; when the database file is
+        # unchanged the memoized schema is returned without a worker-thread hop
+        schema = self._cached_schema(self._schema_file_key())
+        if schema is not None:
+            return schema
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_schema)
+    
+    def iter_query(self, query: str, batch: int = 1000,
+                   params: Optional[Dict[str, Any]] = None) -> Iterator[List[Any]]:
+        """
+        Execute a SQL query and stream its results in batches.
+        
+        The connection stays checked out until the iterator is exhausted or closed.
+        
+        Args:
+            query: SQL query string
+            batch: Number of rows fetched per batch
+            params: Values for the query's named (``:name``) parameters
+            
+        Yields:
+            Lists of row mappings (at most ``batch`` rows each)
+        """
+        words = query.lstrip().split(None, 1)
+        is_write = bool(words) and words[0].upper() in self._WRITE_KEYWORDS
+        
+        try:
+            with self.get_connection() as connection:
+                result = connection.execute(text(query), params or {}).mappings()
+                while True:
+                    rows = result.fetchmany(batch)
+                    if not rows:
+                        break
+                    yield rows
+        finally:
+            if is_write:
+                self.invalidate_schema_cache()
     
     def execute_query(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -175,19 +420,83 @@ class DatabaseManager:
         Args:
             query: SQL query string
             
+        Returns:
+            List of dictionaries representing query results
+        """
+        return self.execute_query_params(query, {})
+    
+    async def aexecute_query(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Execute a SQL query in a worker thread without blocking the event loop.
+        
+        Args:
+            query: SQL query string
+            
+        Returns:
+            List of dictionaries representing query results
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute_query, query)
+    
+    def execute_query_params(self, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Execute a parameterized SQL query and return results.
+        
+        Binding values instead of formatting them into the SQL keeps the statement
+        text constant, so SQLite can reuse the prepared statement.
+        
+        Args:
+            query: SQL query string with named (``:name``) parameters
+            params: Values for the named parameters
+            
         Returns:
             List of dictionaries representing query results
         """
+        try:
+            data = [dict(row) for rows in self.iter_query(query, params=params) for row in rows]
+            logging.info(f"Query executed successfully, returned {len(data)} rows")
+            return data
+        except Exception as e:
+            logging.error(f"Error executing query: {e}")
+            raise
+    
+    def execute_query_df(self, query: str) -> "pd.DataFrame":
+        """
+        Execute a SQL query and return the results as a DataFrame.
+        
+        Results are stored column-wise instead of as one dictionary per row,
+        which is much cheaper for large results that are aggregated or displayed.
+        
+        Args:
+            query: SQL query string
+            
+        Returns:
+            DataFrame with the query results
+        """
+        import pandas as pd
+        
         try:
             with self.get_connection() as connection:
-                result = connection.execute(text(query))
-                data = [dict(row._mapping) for row in result]
-                logging.info(f"Query executed successfully, returned {len(data)} rows")
-                return data
+                df = pd.read_sql_query(text(query), connection)
+                logging.info(f"Query executed successfully, returned {len(df)} rows")
+                return df
         except Exception as e:
             logging.error(f"Error executing query: {e}")
             raise
     
+    def _valid_tables(self) -> frozenset:
+        """
+        Get the names of the tables that currently exist, from the memoized schema.
+        
+        Returns:
+            Set of table names safe to interpolate into SQL
+        """
+        return frozenset(self.get_schema()["tables"])
+    
+    def invalidate_schema_cache(self) -> None:
+        """Discard the memoized schema so the next get_schema() call rebuilds it."""
+        self._schema_memo = None
+    
     def get_table_sample(self, table_name: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Get a sample of data from a table for preview purposes.
@@ -200,12 +509,24 @@ class DatabaseManager:
             List of dictionaries representing sample data
         """
         try:
-            query = f"SELECT * FROM {table_name} LIMIT {limit}"
-            return self.execute_query(query)
+            if table_name not in self._valid_tables():
+                raise ValueError(f"Unknown table: {table_name!r}")
+            query = f'SELECT * FROM "{table_name}" LIMIT :lim'
+            return self.execute_query_params(query, {"lim": limit})
         except Exception as e:
             logging.error(f"Error getting table sample: {e}")
             return []
 
 
-# Global instance
+# Canonical shared instance
 db_manager = DatabaseManager()
+
+
+def get_db_manager() -> DatabaseManager:
+    """
+    Get the shared database manager.
+    
+    Returns:
+        The module-level DatabaseManager instance
+    """
+    return db_manager
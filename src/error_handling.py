@@ -2,37 +2,67 @@
 Centralized error handling and validation module.
 """
 
+import sys
 import logging
-from typing import Dict, Any, Optional, List
-from enum import Enum
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
+from enum import IntEnum
 
-class ErrorSeverity(Enum):
-    """Error severity levels."""
-    INFO = "info"
-    WARNING = "warning"  
-    ERROR = "error"
-    CRITICAL = "critical"
+class ErrorSeverity(IntEnum):
+    """Error severity levels, ordered so they compare as plain integers."""
+    INFO = 0
+    WARNING = 1
+    ERROR = 2
+    CRITICAL = 3
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name used in dictionaries and summaries (e.g. "error")."""
+        return self.name.lower()
+    
+    @classmethod
+    def _missing_(cls, value: Any) -> Optional["ErrorSeverity"]:
+        # Accept the string labels the enum used to have as values
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
+
+# Logging level used for each severity
+_SEVERITY_TO_LEVEL = {
+    ErrorSeverity.INFO: logging.INFO,
+    ErrorSeverity.WARNING: logging.WARNING,
+    ErrorSeverity.ERROR: logging.ERROR,
+    ErrorSeverity.CRITICAL: logging.CRITICAL
+}
+
+# Shared read-only default so errors without context don't each allocate a dict
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class SystemError:
     """Structured error representation."""
     
-    def __init__(self, 
-                 code: str, 
-                 message: str, 
-                 severity: ErrorSeverity = ErrorSeverity.ERROR,
-                 context: Optional[Dict[str, Any]] = None):
-        self.code = code
-        self.message = message
-        self.severity = severity
-        self.context = context or {}
+    code: str
+    message: str
+    severity: ErrorSeverity = ErrorSeverity.ERROR
+    context: Optional[Mapping[str, Any]] = None
+    
+    def __post_init__(self) -> None:
+        if self.context is None:
+            object.__setattr__(self, "context", _EMPTY_CONTEXT)
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert error to dictionary format."""
         return {
             "code": self.code,
             "message": self.message,
-            "severity": self.severity.value,
-            "context": self.context
+            "severity": self.severity.label,
+            "context": dict(self.context)
         }
 
 class ErrorHandler:
@@ -40,20 +70,21 @@ class ErrorHandler:
     
     def __init__(self):
         self.errors: List[SystemError] = []
+        # Per-severity counts and lists, kept in step with self.errors
+        self._counts: Counter = Counter()
+        self._by_severity: Dict[ErrorSeverity, List[SystemError]] = {s: [] for s in ErrorSeverity}
+        self._log = logging.getLogger("error_handler")
         
     def add_error(self, error: SystemError) -> None:
         """Add an error to the collection."""
         self.errors.append(error)
+        self._counts[error.severity] += 1
+        self._by_severity[error.severity].append(error)
         
-        # Log based on severity
-        if error.severity == ErrorSeverity.CRITICAL:
-            logging.critical(f"{error.code}: {error.message}")
-        elif error.severity == ErrorSeverity.ERROR:
-            logging.error(f"{error.code}: {error.message}")
-        elif error.severity == ErrorSeverity.WARNING:
-            logging.warning(f"{error.code}: {error.message}")
-        else:
-            logging.info(f"{error.code}: {error.message}")
+        # Log based on severity, skipping all formatting when the level is filtered out
+        level = _SEVERITY_TO_LEVEL[error.severity]
+        if self._log.isEnabledFor(level):
+            self._log.log(level, "%s: %s", error.code, error.message)
     
     def handle_exception(self, 
                         e: Exception, 
@@ -71,27 +102,24 @@ class ErrorHandler:
     
     def get_errors(self, severity: Optional[ErrorSeverity] = None) -> List[SystemError]:
         """Get errors, optionally filtered by severity."""
-        if severity:
-            return [e for e in self.errors if e.severity == severity]
+        # INFO is 0, so the filter is tested against None rather than truthiness
+        if severity is not None:
+            return self._by_severity[severity].copy()
         return self.errors.copy()
     
     def clear_errors(self) -> None:
         """Clear all collected errors."""
         self.errors.clear()
+        self._counts.clear()
+        for errors in self._by_severity.values():
+            errors.clear()
     
     def has_errors(self, min_severity: ErrorSeverity = ErrorSeverity.ERROR) -> bool:
         """Check if there are errors of minimum severity."""
-        severity_order = {
-            ErrorSeverity.INFO: 0,
-            ErrorSeverity.WARNING: 1,
-            ErrorSeverity.ERROR: 2,
-            ErrorSeverity.CRITICAL: 3
-        }
-        min_level = severity_order[min_severity]
-        
         return any(
-            severity_order[e.severity] >= min_level 
-            for e in self.errors
+            self._counts[severity]
+            for severity in ErrorSeverity
+            if severity >= min_severity
         )
     
     def get_error_summary(self) -> Dict[str, Any]:
@@ -102,8 +130,7 @@ class ErrorHandler:
         }
         
         for severity in ErrorSeverity:
-            count = len([e for e in self.errors if e.severity == severity])
-            summary["by_severity"][severity.value] = count
+            summary["by_severity"][severity.label] = self._counts[severity]
             
         return summary
 
@@ -136,3 +163,9 @@ class ErrorCodes:
     CONFIG_INVALID = "CONFIG_INVALID"
     INITIALIZATION_FAILED = "INITIALIZATION_FAILED"
     VALIDATION_FAILED = "VALIDATION_FAILED"
+
+# Intern the code strings so lookups keyed on them can short-circuit on identity
+for _name, _value in vars(ErrorCodes).items():
+    if not _name.startswith("_") and isinstance(_value, str):
+        setattr(ErrorCodes, _name, sys.intern(_value))
+del _name, _value
@@ -1,52 +1,79 @@
 import os
+import queue
+import atexit
+import asyncio
+import argparse
 import logging
-import time
-from langgraph.graph import StateGraph, END
+from time import monotonic
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from langgraph.graph import StateGraph, START, END
 from config import LOG_FILE
 from state import AgentState, create_initial_state, update_state_efficiently, get_state_summary
 from database_manager import db_manager
 from agent_manager import agent_manager
-from typing import Dict, Any
+from typing import Dict, Any, List, AsyncIterable, AsyncIterator
 
-# Set up optimized logging
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-    filename=LOG_FILE,
-    filemode='a'
-)
+root_logger = logging.getLogger()
 
-# Add console handler for better debugging
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logging.getLogger().addHandler(console_handler)
+def _configure_logging() -> None:
+    """
+    Set up the rotating log file and console output for the CLI.
+    
+    Called from the entry point rather than at import, so importers such as the
+    tests and the web interface skip the log directory and handler setup. Does
+    nothing if it has already run.
+    """
+    if any(isinstance(handler, QueueHandler) for handler in root_logger.handlers):
+        return
+    
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    root_logger.setLevel(logging.INFO)
+    
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+    ))
+    
+    # Add console handler for better debugging
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(formatter)
+    
+    # Nodes only enqueue records; a background listener does the file and console I/O
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
 
-def get_schema(state: Dict[str, Any]) -> Dict[str, Any]:
+async def get_schema(state: Dict[str, Any]) -> Dict[str, Any]:
     """Optimized database schema extraction with performance tracking"""
-    step_start = time.time()
+    # Callers that already hold the schema pass it in the initial state
+    if state.get("schema"):
+        return update_state_efficiently(state, {"step_times": {"get_schema": 0.0}})
+    
+    step_start = monotonic()
     
     try:
         logging.info("Starting optimized database schema extraction")
         
         # Use optimized database manager
-        schema_info = db_manager.get_schema()
+        schema_info = await db_manager.aget_schema()
         
         if "error" in schema_info:
-            logging.error(f"Schema extraction error: {schema_info['error']}")
+            logging.error("Schema extraction error: %s", schema_info['error'])
             return update_state_efficiently(state, {
                 "schema": schema_info["schema_text"],
-                "errors": {**state.get("errors", {}), "schema": schema_info["error"]}
+                "errors": {"schema": schema_info["error"]}
             })
         
-        logging.info(f"Schema extracted successfully: {schema_info['table_count']} tables found")
+        logging.info("Schema extracted successfully: %d tables found", schema_info['table_count'])
         
         # Track performance
-        elapsed = time.time() - step_start
-        step_times = state.get("step_times", {})
-        step_times["get_schema"] = elapsed
+        elapsed = monotonic() - step_start
+        step_times = {"get_schema": elapsed}
         
         return update_state_efficiently(state, {
             "schema": schema_info["schema_text"],
@@ -58,12 +85,12 @@ def get_schema(state: Dict[str, Any]) -> Dict[str, Any]:
         logging.error(error_msg)
         return update_state_efficiently(state, {
             "schema": f"Error: {error_msg}",
-            "errors": {**state.get("errors", {}), "schema": error_msg}
+            "errors": {"schema": error_msg}
         })
 
-def route_question(state: Dict[str, Any]) -> Dict[str, Any]:
+async def route_question(state: Dict[str, Any]) -> Dict[str, Any]:
     """Optimized question routing with cached agents"""
-    step_start = time.time()
+    step_start = monotonic()
     
     try:
         question = state.get("question", "")
@@ -72,12 +99,11 @@ def route_question(state: Dict[str, Any]) -> Dict[str, Any]:
             return update_state_efficiently(state, {"route": "sql"})
         
         # Use cached agent manager
-        route = agent_manager.route_question(question)
+        route = await agent_manager.aroute_question(question)
         
         # Track performance
-        elapsed = time.time() - step_start
-        step_times = state.get("step_times", {})
-        step_times["route_question"] = elapsed
+        elapsed = monotonic() - step_start
+        step_times = {"route_question": elapsed}
         
         return update_state_efficiently(state, {
             "route": route,
@@ -89,12 +115,12 @@ def route_question(state: Dict[str, Any]) -> Dict[str, Any]:
         logging.error(error_msg)
         return update_state_efficiently(state, {
             "route": "sql",
-            "errors": {**state.get("errors", {}), "routing": error_msg}
+            "errors": {"routing": error_msg}
         })
 
-def run_sql_query(state: Dict[str, Any]) -> Dict[str, Any]:
+async def run_sql_query(state: Dict[str, Any]) -> Dict[str, Any]:
     """Optimized SQL query generation and execution"""
-    step_start = time.time()
+    step_start = monotonic()
     
     try:
         question = state.get("question", "")
@@ -106,21 +132,21 @@ def run_sql_query(state: Dict[str, Any]) -> Dict[str, Any]:
             return update_state_efficiently(state, {
                 "sql_query": "ERROR: " + error_msg,
                 "data": "No data due to error",
-                "errors": {**state.get("errors", {}), "sql": error_msg}
+                "errors": {"sql": error_msg}
             })
         
         # Generate SQL using cached agent
-        query = agent_manager.generate_sql_query(question, schema)
+        query = await agent_manager.agenerate_sql_query(question, schema)
         
         # Execute query using optimized database manager
-        data = db_manager.execute_query(query)
+        data = await db_manager.aexecute_query(query)
+        agent_manager.cache_sql_query(question, schema, query)
         
         # Track performance
-        elapsed = time.time() - step_start
-        step_times = state.get("step_times", {})
-        step_times["run_sql_query"] = elapsed
+        elapsed = monotonic() - step_start
+        step_times = {"run_sql_query": elapsed}
         
-        logging.info(f"SQL operation completed successfully in {elapsed:.2f}s")
+        logging.info("SQL operation completed successfully in %.2fs", elapsed)
         
         return update_state_efficiently(state, {
             "sql_query": query,
@@ -134,12 +160,12 @@ def run_sql_query(state: Dict[str, Any]) -> Dict[str, Any]:
         return update_state_efficiently(state, {
             "sql_query": state.get("sql_query", "Unknown"),
             "data": f"Error: {error_msg}",
-            "errors": {**state.get("errors", {}), "sql_execution": error_msg}
+            "errors": {"sql_execution": error_msg}
         })
 
-def generate_chart(state: Dict[str, Any]) -> Dict[str, Any]:
+async def generate_chart(state: Dict[str, Any]) -> Dict[str, Any]:
     """Optimized chart code generation"""
-    step_start = time.time()
+    step_start = monotonic()
     
     try:
         question = state.get("question", "")
@@ -148,18 +174,17 @@ def generate_chart(state: Dict[str, Any]) -> Dict[str, Any]:
             logging.error(error_msg)
             return update_state_efficiently(state, {
                 "chart_code": "# ERROR: " + error_msg,
-                "errors": {**state.get("errors", {}), "chart": error_msg}
+                "errors": {"chart": error_msg}
             })
         
         # Generate chart code using cached agent
-        chart_code = agent_manager.generate_chart_code(question, state.get("data", ""))
+        chart_code = await agent_manager.agenerate_chart_code(question, state.get("data", ""))
         
         # Track performance
-        elapsed = time.time() - step_start
-        step_times = state.get("step_times", {})
-        step_times["generate_chart"] = elapsed
+        elapsed = monotonic() - step_start
+        step_times = {"generate_chart": elapsed}
         
-        logging.info(f"Chart generation completed successfully in {elapsed:.2f}s")
+        logging.info("Chart generation completed successfully in %.2fs", elapsed)
         
         return update_state_efficiently(state, {
             "chart_code": chart_code,
@@ -171,37 +196,194 @@ def generate_chart(state: Dict[str, Any]) -> Dict[str, Any]:
         logging.error(error_msg)
         return update_state_efficiently(state, {
             "chart_code": f"# Error: {error_msg}",
-            "errors": {**state.get("errors", {}), "chart_generation": error_msg}
+            "errors": {"chart_generation": error_msg}
         })
 
-# Define the optimized graph
-workflow = StateGraph(AgentState)
+def dispatch(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Join point after schema extraction and routing have both finished."""
+    return {}
+
+def route_after_dispatch(state: Dict[str, Any]) -> str:
+    """Pick the branch chosen by route_question, defaulting to SQL."""
+    return state.get("route") or "sql"
+
+# Branch names returned by route_after_dispatch() mapped to their nodes
+ROUTE_MAP = {
+    "sql": "run_sql_query",
+    "chart": "generate_chart",
+}
+
+@lru_cache(maxsize=1)
+def get_app() -> Any:
+    """
+    Build and compile the workflow graph, once per process.
+    
+    Returns:
+        Compiled LangGraph workflow
+    """
+    # Define the optimized graph
+    workflow = StateGraph(AgentState)
+    
+    workflow.add_node("get_schema", get_schema)
+    workflow.add_node("route_question", route_question)
+    workflow.add_node("dispatch", dispatch)
+    workflow.add_node("run_sql_query", run_sql_query)
+    workflow.add_node("generate_chart", generate_chart)
+    
+    # Routing only needs the question, so it runs in the same superstep as schema extraction
+    workflow.add_edge(START, "get_schema")
+    workflow.add_edge(START, "route_question")
+    workflow.add_edge(["get_schema", "route_question"], "dispatch")
+    workflow.add_conditional_edges("dispatch", route_after_dispatch, ROUTE_MAP)
+    workflow.add_edge("run_sql_query", END)
+    workflow.add_edge("generate_chart", END)
+    
+    # Compile the optimized graph
+    return workflow.compile()
+
+app = get_app()
+
+def warmup() -> None:
+    """
+    Do the one-time work the first question would otherwise pay for.
+    
+    Prewarms the agents and waits for them, loads the route-embedding model
+    when it is installed, and reads the schema so a pooled database
+    connection is opened and the schema memo is filled. Failures are logged
+    and left for the first question to report.
+    """
+    warmup_start = monotonic()
+    try:
+        agent_manager.wait_ready(timeout=30)
+        agent_manager.warm_route_cache()
+        db_manager.get_schema()
+    except Exception as e:
+        logging.warning("Warmup failed: %s", e)
+    else:
+        logging.info("Warmup completed in %.2fs", monotonic() - warmup_start)
+
+# Maximum number of questions processed concurrently in batch mode
+BATCH_CONCURRENCY = 4
+
+async def process_question(question: str) -> Dict[str, Any]:
+    """
+    Run a single question through the compiled workflow.
+    
+    Args:
+        question: User question
+        
+    Returns:
+        Final workflow state
+    """
+    return await app.ainvoke(create_initial_state(question))
+
+def print_result(result: Dict[str, Any], duration: float) -> None:
+    """
+    Display a workflow result with its errors and step timings.
+    
+    Args:
+        result: Final workflow state
+        duration: Wall-clock seconds spent on the question
+    """
+    print(f"\n--- Agent's Answer (processed in {duration:.2f}s) ---")
+    
+    # Display results with error handling
+    if result.get("errors"):
+        print("⚠️  Warnings/Errors occurred:")
+        for error_type, error_msg in result["errors"].items():
+            print(f"  - {error_type}: {error_msg}")
+    
+    if "data" in result and not str(result["data"]).startswith("Error:"):
+        print(f"SQL Query: {result.get('sql_query', 'N/A')}")
+        print(f"Data: {result['data']}")
+    elif "chart_code" in result and not str(result["chart_code"]).startswith("# ERROR:"):
+        print(f"Chart Code:\n{result['chart_code']}")
+    else:
+        print("❌ No valid results generated. Check the logs for details.")
+    
+    # Display performance info
+    if result.get("step_times"):
+        print(f"\n📊 Performance Summary:")
+        for step, duration in result["step_times"].items():
+            print(f"  - {step}: {duration:.3f}s")
 
-workflow.add_node("get_schema", get_schema)
-workflow.add_node("route_question", route_question)
-workflow.add_node("run_sql_query", run_sql_query)
-workflow.add_node("generate_chart", generate_chart)
+async def serve(questions: AsyncIterable[str], concurrency: int = BATCH_CONCURRENCY) -> List[Dict[str, Any]]:
+    """
+    Process a stream of questions concurrently so their LLM calls overlap.
+    
+    Args:
+        questions: Async iterable of questions
+        concurrency: Maximum number of questions in flight at once
+        
+    Returns:
+        Final workflow states, in the order the questions were received
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(number: int, question: str) -> Dict[str, Any]:
+        async with semaphore:
+            logging.info("Processing question #%d: %s", number, question)
+            question_start = monotonic()
+            try:
+                result = await process_question(question)
+            except Exception as e:
+                error_msg = f"Error processing question: {str(e)}"
+                logging.error(error_msg)
+                result = {"question": question, "errors": {"processing": error_msg}}
+            print(f"\nQuestion #{number}: {question}")
+            print_result(result, monotonic() - question_start)
+            return result
+    
+    tasks = []
+    async for question in questions:
+        tasks.append(asyncio.ensure_future(run(len(tasks) + 1, question)))
+    return list(await asyncio.gather(*tasks))
 
-workflow.set_entry_point("get_schema")
-workflow.add_edge("get_schema", "route_question")
-workflow.add_conditional_edges(
-    "route_question",
-    lambda x: x["route"],
-    {
-        "sql": "run_sql_query",
-        "chart": "generate_chart",
-    },
-)
-workflow.add_edge("run_sql_query", END)
-workflow.add_edge("generate_chart", END)
+async def read_batch_file(path: str) -> AsyncIterator[str]:
+    """
+    Stream the non-empty lines of a batch file as questions.
+    
+    Args:
+        path: Text file with one question per line
+        
+    Yields:
+        Questions from the file
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            question = line.strip()
+            if question:
+                yield question
 
-# Compile the optimized graph
-app = workflow.compile()
+async def run_batch(path: str) -> None:
+    """
+    Answer every question in a batch file, BATCH_CONCURRENCY at a time.
+    
+    Args:
+        path: Text file with one question per line
+    """
+    logging.info("=== Starting AI Data Analyst batch run: %s ===", path)
+    
+    if not db_manager.health_check():
+        print("ERROR: Database health check failed")
+        print("Please ensure the database is properly created and accessible.")
+        return
+    
+    batch_start = monotonic()
+    await asyncio.get_running_loop().run_in_executor(None, warmup)
+    results = await serve(read_batch_file(path))
+    batch_duration = monotonic() - batch_start
+    
+    print(f"\nBatch Statistics:")
+    print(f"Total time: {batch_duration:.2f}s")
+    print(f"Questions processed: {len(results)}")
+    logging.info("Batch completed: %d questions in %.2fs", len(results), batch_duration)
 
-def main():
+async def main():
     """
     Optimized main function with performance monitoring and better error handling.
     """
+    loop = asyncio.get_running_loop()
     try:
         logging.info("=== Starting Optimized AI Data Analyst Application ===")
         
@@ -211,71 +393,49 @@ def main():
             print("Please ensure the database is properly created and accessible.")
             return
         
+        # Warm up in the background while the user types the first question
+        loop.run_in_executor(None, warmup)
+        
         # Display agent cache info
         cache_info = agent_manager.get_cache_info()
-        logging.info(f"Agent manager cache info: {cache_info}")
+        logging.info("Agent manager cache info: %s", cache_info)
         
         print("--- Optimized AI Data Analyst is ready. Ask a question or type 'exit' to quit. ---")
         print("Performance monitoring is enabled. Check logs for detailed timing information.")
         
-        session_start = time.time()
+        session_start = monotonic()
         question_count = 0
         
         while True:
             try:
-                user_question = input("\nYour question: ")
+                user_question = await loop.run_in_executor(None, input, "\nYour question: ")
                 
                 if user_question.lower() == 'exit':
-                    session_duration = time.time() - session_start
+                    session_duration = monotonic() - session_start
                     print(f"\nSession Statistics:")
                     print(f"Total time: {session_duration:.2f}s")
                     print(f"Questions processed: {question_count}")
                     if question_count > 0:
                         print(f"Average time per question: {session_duration/question_count:.2f}s")
                     print("Exiting application.")
-                    logging.info(f"Session completed: {question_count} questions in {session_duration:.2f}s")
+                    logging.info("Session completed: %d questions in %.2fs", question_count, session_duration)
                     break
                 
                 if not user_question.strip():
                     print("Please enter a question.")
                     continue
 
-                question_start = time.time()
+                question_start = monotonic()
                 question_count += 1
                 
-                logging.info(f"Processing question #{question_count}: {user_question}")
+                logging.info("Processing question #%d: %s", question_count, user_question)
 
-                # Create optimized initial state
-                initial_state = create_initial_state(user_question)
-                result = app.invoke(initial_state)
-                
-                question_duration = time.time() - question_start
-                
-                print(f"\n--- Agent's Answer (processed in {question_duration:.2f}s) ---")
+                result = await process_question(user_question)
+                print_result(result, monotonic() - question_start)
                 
-                # Display results with error handling
-                if result.get("errors"):
-                    print("⚠️  Warnings/Errors occurred:")
-                    for error_type, error_msg in result["errors"].items():
-                        print(f"  - {error_type}: {error_msg}")
-                
-                if "data" in result and not str(result["data"]).startswith("Error:"):
-                    print(f"SQL Query: {result.get('sql_query', 'N/A')}")
-                    print(f"Data: {result['data']}")
-                elif "chart_code" in result and not str(result["chart_code"]).startswith("# ERROR:"):
-                    print(f"Chart Code:\n{result['chart_code']}")
-                else:
-                    print("❌ No valid results generated. Check the logs for details.")
-                
-                # Display performance info
-                if result.get("step_times"):
-                    print(f"\n📊 Performance Summary:")
-                    for step, duration in result["step_times"].items():
-                        print(f"  - {step}: {duration:.3f}s")
-                
-                # Display state summary for debugging
-                summary = get_state_summary(result)
-                logging.info(f"Question #{question_count} completed: {summary}")
+                # Log the state summary for debugging, building it only if it will be emitted
+                if root_logger.isEnabledFor(logging.INFO):
+                    root_logger.info("Question #%d completed: %s", question_count, get_state_summary(result))
                 
             except KeyboardInterrupt:
                 print("\nApplication interrupted by user.")
@@ -293,4 +453,12 @@ def main():
         logging.critical(error_msg)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="AI Data Analyst command-line interface")
+    parser.add_argument("--batch", metavar="FILE", help="answer the questions in FILE (one per line) concurrently")
+    args = parser.parse_args()
+    _configure_logging()
+    
+    if args.batch:
+        asyncio.run(run_batch(args.batch))
+    else:
+        asyncio.run(main())
@@ -10,9 +10,24 @@ This module provides:
 
 from typing import TypedDict, Annotated, Sequence, Optional, Any, Dict
 import operator
+from time import monotonic
 from langchain_core.messages import BaseMessage
 
 
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reducer that merges dictionary fields written by parallel workflow branches.
+    
+    Args:
+        left: Current value
+        right: Value written by a node
+        
+    Returns:
+        Merged dictionary (right wins on duplicate keys)
+    """
+    return {**(left or {}), **(right or {})}
+
+
 class AgentState(TypedDict, total=False):  # total=False allows optional fields
     """
     Optimized state dictionary for the multi-agent workflow.
@@ -29,11 +44,15 @@ class AgentState(TypedDict, total=False):  # total=False allows optional fields
     
     # Performance tracking fields
     start_time: Optional[float]
-    step_times: Optional[Dict[str, float]]
+    step_times: Annotated[Optional[Dict[str, float]], merge_dicts]
     
-    # Error handling fields
-    errors: Optional[Dict[str, str]]
-    warnings: Optional[Dict[str, str]]
+    # Error handling fields (merged so parallel nodes can report independently)
+    errors: Annotated[Optional[Dict[str, str]], merge_dicts]
+    warnings: Annotated[Optional[Dict[str, str]], merge_dicts]
+
+
+# Field names accepted by update_state_efficiently(), computed once
+_ALLOWED_KEYS = frozenset(AgentState.__annotations__)
 
 
 def create_initial_state(question: str) -> AgentState:
@@ -46,11 +65,9 @@ def create_initial_state(question: str) -> AgentState:
     Returns:
         Initial agent state
     """
-    import time
-    
     return AgentState(
         question=question,
-        start_time=time.time(),
+        start_time=monotonic(),
         step_times={},
         errors={},
         warnings={}
@@ -59,33 +76,28 @@ def create_initial_state(question: str) -> AgentState:
 
 def update_state_efficiently(current_state: AgentState, updates: Dict[str, Any]) -> AgentState:
     """
-    Efficiently update state by only modifying changed fields.
+    Build the partial state update a workflow node returns.
+    
+    Only the changed fields are returned, so nodes running in parallel never
+    overwrite each other's fields; dictionary fields such as ``errors`` are
+    merged by their reducers, so nodes pass only their own entries.
     
     Args:
-        current_state: Current state
+        current_state: Current state (not modified)
         updates: Dictionary of updates to apply
         
     Returns:
-        Updated state
+        Partial state containing only the updated fields
     """
-    import time
-    
-    # Track timing for performance monitoring
-    if 'step_times' not in current_state:
-        current_state['step_times'] = {}
-    
-    # Update only the fields that changed
-    for key, value in updates.items():
-        if key in AgentState.__annotations__:
-            current_state[key] = value
-    
-    # Update timing
-    current_time = time.time()
-    if 'start_time' in current_state:
-        elapsed = current_time - current_state['start_time']
-        current_state['step_times'][f"total_elapsed"] = elapsed
-    
-    return current_state
+    # Keep only the fields that belong to the state, filtered in one set operation
+    keys = updates.keys() & _ALLOWED_KEYS
+    if len(keys) == len(updates):
+        return AgentState(updates)
+    return AgentState({key: updates[key] for key in keys})
+
+
+# Fields reported as has_<field> flags by get_state_summary()
+_SUMMARY_PRESENCE_KEYS = ("question", "data", "schema", "chart_code", "sql_query")
 
 
 def get_state_summary(state: AgentState) -> Dict[str, Any]:
@@ -98,16 +110,10 @@ def get_state_summary(state: AgentState) -> Dict[str, Any]:
     Returns:
         Summary dictionary
     """
-    summary = {
-        "has_question": bool(state.get("question")),
-        "has_data": bool(state.get("data")),
-        "has_schema": bool(state.get("schema")),
-        "has_chart_code": bool(state.get("chart_code")),
-        "route": state.get("route"),
-        "has_sql_query": bool(state.get("sql_query")),
-        "error_count": len(state.get("errors", {})),
-        "warning_count": len(state.get("warnings", {}))
-    }
+    summary: Dict[str, Any] = {f"has_{key}": bool(state.get(key)) for key in _SUMMARY_PRESENCE_KEYS}
+    summary["route"] = state.get("route")
+    summary["error_count"] = len(state.get("errors") or {})
+    summary["warning_count"] = len(state.get("warnings") or {})
     
     # Add timing information if available
     if state.get("step_times"):
@@ -126,11 +132,18 @@ def clear_large_fields(state: AgentState) -> AgentState:
     Returns:
         State with large fields cleared
     """
-    # Clear potentially large fields while keeping metadata
-    if state.get("data") and len(str(state["data"])) > 1000:
-        state["data"] = f"[Large dataset cleared - {len(str(state['data']))} chars]"
-    
-    if state.get("schema") and len(str(state["schema"])) > 500:
-        state["schema"] = f"[Schema cleared - {len(str(state['schema']))} chars]"
+    # Clear potentially large fields while keeping metadata; each value is
+    # stringified at most once
+    data = state.get("data")
+    if data:
+        size = len(data if isinstance(data, str) else str(data))
+        if size > 1000:
+            state["data"] = f"[Large dataset cleared - {size} chars]"
+    
+    schema = state.get("schema")
+    if schema:
+        size = len(schema if isinstance(schema, str) else str(schema))
+        if size > 500:
+            state["schema"] = f"[Schema cleared - {size} chars]"
     
     return state
@@ -10,354 +10,433 @@ Comprehensive testing for the AI Data Analyst system covering:
 5. Workflow compilation
 6. Streamlit interface readiness
 7. Web interface component architecture
+
+The database, agent and workflow checks are also plain pytest tests that
+share session fixtures from conftest.py; `python test_unified.py` runs the
+whole suite through UnifiedTestSuite.
 """
 
 import os
 import sys
 import logging
+from logging.handlers import MemoryHandler
+import importlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from importlib.machinery import PathFinder
+from functools import cached_property
 from pathlib import Path
 
+# Project locations, resolved once at import
+PROJECT_ROOT = Path(__file__).parent.absolute()
+SRC_DIR = PROJECT_ROOT / "src"
+WEB_INTERFACE_DIR = PROJECT_ROOT / "web_interface"
+_PROJECT_ROOT_STR = str(PROJECT_ROOT)
+_SRC_DIR_STR = str(SRC_DIR)
+_WEB_UTILS_PATH = [str(WEB_INTERFACE_DIR / "utils")]
+
+# Paths that must exist for the system to run, relative to the project root
+ESSENTIAL_FILES = frozenset({
+    "src/config.py",
+    "src/main.py",
+    "src/agent_manager.py",
+    "src/database_manager.py",
+    "web_interface/app.py",
+    "web_interface/ai_interface.py",
+    "data/sales_data.csv",
+    "requirements.txt",
+})
+ESSENTIAL_DIRS = frozenset({
+    "src/agents",
+    "web_interface/components",
+    "web_interface/utils",
+    "web_interface/config",
+    "logs",
+    "data",
+})
+ESSENTIAL_PATHS = ESSENTIAL_FILES | ESSENTIAL_DIRS
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+
+# Suite output is buffered and written to stdout in blocks: after each test,
+# and immediately for warnings and failures
+logger = logging.getLogger("unified_tests")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter('%(message)s'))
+_output = MemoryHandler(capacity=1000, flushLevel=logging.WARNING, target=_console)
+logger.addHandler(_output)
+
+def flush_output():
+    """Write any buffered suite output."""
+    _output.flush()
+
+def teardown_function(function):
+    """pytest hook: write each test's output when it finishes."""
+    flush_output()
+
+class _TestOutputBuffer(logging.Handler):
+    """Collects suite output per test while tests run concurrently."""
+    
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+        self.records = {}
+    
+    def run(self, test_name, func, *args):
+        """Call func in the current thread, attributing its output to test_name."""
+        self.records[test_name] = []
+        self._local.test_name = test_name
+        try:
+            return func(*args)
+        finally:
+            self._local.test_name = None
+    
+    def emit(self, record):
+        records = self.records.get(getattr(self._local, "test_name", None))
+        if records is None:
+            _output.handle(record)
+        else:
+            records.append(record)
+
+def test_database(db_mgr):
+    """Test database connectivity and health"""
+    logger.info("\n🗃️  Testing Database...")
+    
+    # Health check and schema retrieval share one connection
+    health, schema = db_mgr.health_and_schema()
+    assert health.get('status') == 'healthy', f"Database issues: {health}"
+    logger.info(f"✅ Database healthy: {health}")
+    
+    # Test schema retrieval
+    assert 'tables' in schema and len(schema['tables']) > 0, "No tables found in database"
+    logger.info(f"✅ Schema retrieval working: {schema['table_count']} tables found")
+
+def test_error_severity_filter():
+    """Test that error filtering works for every severity, including INFO"""
+    from error_handling import ErrorHandler, ErrorSeverity, SystemError
+    
+    logger.info("\n🚨 Testing Error Severity Filter...")
+    
+    handler = ErrorHandler()
+    handler.add_error(SystemError("NOTE", "informational", ErrorSeverity.INFO))
+    handler.add_error(SystemError("FAIL", "failure", ErrorSeverity.ERROR))
+    
+    assert [e.code for e in handler.get_errors(ErrorSeverity.INFO)] == ["NOTE"]
+    assert [e.code for e in handler.get_errors(ErrorSeverity.ERROR)] == ["FAIL"]
+    assert len(handler.get_errors()) == 2
+    logger.info("✅ Severity filter returns only the requested errors")
+
+def test_enhanced_database_features(db_mgr):
+    """Test enhanced database features including analytical views and indexes"""
+    from sqlalchemy import text
+    
+    logger.info("🧪 Testing Enhanced Database Features")
+    
+    views = (
+        ("📊", "sales_summary", "SELECT * FROM sales_summary ORDER BY total_sales DESC LIMIT 3;", "Sales summary"),
+        ("📈", "monthly_trends", "SELECT * FROM monthly_trends LIMIT 100;", "Monthly trends"),
+        ("🏆", "product_performance", "SELECT * FROM product_performance LIMIT 100;", "Product performance"),
+    )
+    
+    # One pooled connection serves every view query and the index check
+    with db_mgr.get_connection() as conn:
+        # Test analytical views
+        for icon, view, query, label in views:
+            logger.info(f"{icon} Testing {view} view")
+            rows = conn.execute(text(query)).fetchall()
+            if len(rows) > 0:
+                logger.info(f"✅ {label} view working: {len(rows)} records found")
+            else:
+                logger.warning(f"⚠️ {label} view returned no data")
+        
+        # Test indexes
+        logger.info("🔍 Testing database indexes")
+        indexes = conn.execute(text("PRAGMA index_list(sales);")).fetchall()
+        logger.info(f"✅ Found {len(indexes)} indexes on sales table")
+    
+    logger.info("✅ Enhanced database features test completed")
+
+def test_agents(agent_mgr):
+    """Test agent manager and agent creation"""
+    logger.info("\n🤖 Testing Agents...")
+    
+    # Test agent manager health
+    health = agent_mgr.health_check()
+    if health.get('status') == 'healthy':
+        logger.info(f"✅ Agent manager healthy: {health}")
+    else:
+        logger.warning(f"⚠️  Agent manager issues: {health}")
+    
+    # Test individual agent creation
+    router = agent_mgr.get_router_agent()
+    sql_agent = agent_mgr.get_sql_agent()
+    chart_agent = agent_mgr.get_chart_agent()
+    
+    assert router and sql_agent and chart_agent, "Agent creation failed"
+    logger.info("✅ All agents created successfully")
+
+def test_workflow(workflow_app):
+    """Test LangGraph workflow compilation"""
+    from state import create_initial_state
+    
+    logger.info("\n🔄 Testing Workflow...")
+    
+    assert workflow_app, "Workflow compilation failed"
+    logger.info("✅ Workflow compilation successful")
+    
+    # Test initial state creation
+    initial_state = create_initial_state("test question")
+    assert 'question' in initial_state, "State creation failed"
+    logger.info("✅ State management working")
 
 class UnifiedTestSuite:
     """Comprehensive test suite for the entire system"""
     
     def __init__(self):
-        self.project_root = Path(__file__).parent.absolute()
-        self.src_dir = self.project_root / "src"
-        self.web_interface_dir = self.project_root / "web_interface"
+        self.project_root = PROJECT_ROOT
+        self.src_dir = SRC_DIR
+        self.web_interface_dir = WEB_INTERFACE_DIR
         self.test_results = {}
         
-    def test_file_structure(self):
-        """Test that the file structure is intact and clean"""
-        print("\n📁 Testing File Structure...")
+        # The standalone suite needs no pytest cache; keep any pytest run it
+        # triggers from writing .pytest_cache
+        os.environ.setdefault("PYTEST_ADDOPTS", "-p no:cacheprovider")
         
-        essential_files = [
-            "src/config.py",
-            "src/main.py", 
-            "src/agent_manager.py",
-            "src/database_manager.py",
-            "web_interface/app.py",
-            "web_interface/ai_interface.py",
-            "data/sales_data.csv",
-            "requirements.txt"
-        ]
+        # Set up import paths once; src comes first so its modules win over
+        # same-named packages under the project root
+        for path in (_PROJECT_ROOT_STR, _SRC_DIR_STR):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+    
+    # Heavy components are imported on first use and shared by every check
+    @cached_property
+    def db_manager(self):
+        from database_manager import db_manager
+        return db_manager
+    
+    @cached_property
+    def agent_manager(self):
+        from agent_manager import agent_manager
+        return agent_manager
+    
+    @cached_property
+    def workflow_app(self):
+        from main import get_app
+        return get_app()
+    
+    @staticmethod
+    def _run_check(check, *components):
+        """Run a module-level check, reporting a failed assertion as False."""
+        try:
+            check(*components)
+            return True
+        except AssertionError as e:
+            logger.error(f"❌ {e}")
+            return False
         
-        essential_dirs = [
-            "src/agents",
-            "web_interface/components",
-            "web_interface/utils", 
-            "web_interface/config",
-            "logs",
-            "data"
-        ]
+    def _existing_paths(self, paths):
+        """
+        Return which of the given project-relative paths exist.
+        
+        Each distinct parent directory is listed once with os.scandir instead
+        of stat-ing every path separately.
+        """
+        existing = set()
+        for parent in {os.path.dirname(path) for path in paths}:
+            try:
+                with os.scandir(os.path.join(_PROJECT_ROOT_STR, parent)) as entries:
+                    for entry in entries:
+                        existing.add(f"{parent}/{entry.name}" if parent else entry.name)
+            except OSError:
+                continue
+        return existing
         
-        missing_files = []
-        missing_dirs = []
+    def test_file_structure(self):
+        """Test that the file structure is intact and clean"""
+        logger.info("\n📁 Testing File Structure...")
         
-        for file_path in essential_files:
-            if not (self.project_root / file_path).exists():
-                missing_files.append(file_path)
-                
-        for dir_path in essential_dirs:
-            if not (self.project_root / dir_path).exists():
-                missing_dirs.append(dir_path)
+        # Directory listings include broken symlinks, so this checks that each
+        # path exists at all (lexists semantics) without stat-ing it
+        existing = self._existing_paths(ESSENTIAL_PATHS)
+        missing = ESSENTIAL_PATHS - existing
         
-        if missing_files or missing_dirs:
-            print(f"❌ Missing files: {missing_files}")
-            print(f"❌ Missing directories: {missing_dirs}")
+        if missing:
+            missing_files = sorted(missing - ESSENTIAL_DIRS)
+            missing_dirs = sorted(missing & ESSENTIAL_DIRS)
+            logger.error(f"❌ Missing files: {missing_files}")
+            logger.error(f"❌ Missing directories: {missing_dirs}")
             return False
         
-        print("✅ File structure is complete")
+        logger.info("✅ File structure is complete")
         return True
         
     def test_imports(self):
         """Test that all import paths work correctly"""
-        print("\n📦 Testing Import System...")
+        logger.info("\n📦 Testing Import System...")
         
-        try:
-            # Change to project root for proper imports
-            original_cwd = os.getcwd()
-            os.chdir(self.project_root)
-            
-            # Test core imports first (clear sys.path)
-            sys.path.insert(0, str(self.src_dir))
-            
-            from config import DB_FILE, MODEL, LOG_FILE
-            print("✅ Config imports working")
-            
-            from database_manager import db_manager
-            print("✅ Database manager import working")
-            
-            from agent_manager import agent_manager
-            print("✅ Agent manager import working")
-            
-            # Store the core config values
-            core_db_file = DB_FILE
-            core_model = MODEL
-            
-            # Clear imports and test web interface separately
-            modules_to_remove = [k for k in sys.modules.keys() if k.startswith('config')]
-            for module in modules_to_remove:
-                if module != 'config':  # Keep the main config
-                    sys.modules.pop(module, None)
-            
-            # Test web interface config imports
-            os.chdir(self.web_interface_dir)
-            sys.path.insert(0, str(self.web_interface_dir))
-            
-            import importlib
-            from web_interface.config import APP_CONFIG, DB_FILE as WEB_DB_FILE, MODEL as WEB_MODEL
-            print("✅ Web interface config working")
-            
-            # Verify config consistency
-            assert core_db_file == WEB_DB_FILE, f"Database file paths don't match: {core_db_file} vs {WEB_DB_FILE}"
-            assert core_model == WEB_MODEL, f"Models don't match: {core_model} vs {WEB_MODEL}"
-            print("✅ Configuration consistency verified")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Import error: {e}")
+        # src and the project root are both on sys.path, so each config
+        # resolves directly from the module cache without chdir or cleanup
+        src_cfg = importlib.import_module("config")
+        logger.info("✅ Config imports working")
+        
+        importlib.import_module("database_manager")
+        logger.info("✅ Database manager import working")
+        
+        importlib.import_module("agent_manager")
+        logger.info("✅ Agent manager import working")
+        
+        # Test web interface config imports
+        web_cfg = importlib.import_module("web_interface.config")
+        logger.info("✅ Web interface config working")
+        
+        # Verify config consistency
+        if src_cfg.DB_FILE != web_cfg.DB_FILE:
+            logger.error(f"❌ Database file paths don't match: {src_cfg.DB_FILE} vs {web_cfg.DB_FILE}")
             return False
-        finally:
-            os.chdir(original_cwd)
+        if src_cfg.MODEL != web_cfg.MODEL:
+            logger.error(f"❌ Models don't match: {src_cfg.MODEL} vs {web_cfg.MODEL}")
+            return False
+        logger.info("✅ Configuration consistency verified")
+        
+        return True
     
     def test_database(self):
         """Test database connectivity and health"""
-        print("\n🗃️  Testing Database...")
-        
-        try:
-            sys.path.insert(0, str(self.src_dir))
-            from database_manager import db_manager
-            
-            health = db_manager.health_check()
-            if health.get('status') == 'healthy':
-                print(f"✅ Database healthy: {health}")
-                
-                # Test schema retrieval
-                schema = db_manager.get_schema()
-                if 'tables' in schema and len(schema['tables']) > 0:
-                    print(f"✅ Schema retrieval working: {schema['table_count']} tables found")
-                    return True
-                else:
-                    print(f"⚠️  No tables found in database")
-                    return False
-            else:
-                print(f"❌ Database issues: {health}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Database test error: {e}")
-            return False
+        return self._run_check(test_database, self.db_manager)
     
     def test_agents(self):
         """Test agent manager and agent creation"""
-        print("\n🤖 Testing Agents...")
-        
-        try:
-            sys.path.insert(0, str(self.src_dir))
-            from agent_manager import agent_manager
-            from agents import create_router_agent, create_sql_agent, create_chart_agent
-            
-            # Test agent manager health
-            health = agent_manager.health_check()
-            if health.get('status') == 'healthy':
-                print(f"✅ Agent manager healthy: {health}")
-            else:
-                print(f"⚠️  Agent manager issues: {health}")
-            
-            # Test individual agent creation
-            router = agent_manager.get_router_agent()
-            sql_agent = agent_manager.get_sql_agent()
-            chart_agent = agent_manager.get_chart_agent()
-            
-            if router and sql_agent and chart_agent:
-                print("✅ All agents created successfully")
-                return True
-            else:
-                print("❌ Agent creation failed")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Agent test error: {e}")
-            return False
+        return self._run_check(test_agents, self.agent_manager)
     
     def test_workflow(self):
         """Test LangGraph workflow compilation"""
-        print("\n🔄 Testing Workflow...")
-        
-        try:
-            sys.path.insert(0, str(self.src_dir))
-            from main import app  # Import the compiled workflow
-            from state import create_initial_state
-            
-            if app:
-                print("✅ Workflow compilation successful")
-                
-                # Test initial state creation
-                initial_state = create_initial_state("test question")
-                if 'question' in initial_state:
-                    print("✅ State management working")
-                    return True
-                else:
-                    print("❌ State creation failed")
-                    return False
-            else:
-                print("❌ Workflow compilation failed")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Workflow test error: {e}")
-            return False
+        return self._run_check(test_workflow, self.workflow_app)
     
     def test_web_interface(self):
         """Test web interface component architecture"""
-        print("\n🌐 Testing Web Interface...")
+        logger.info("\n🌐 Testing Web Interface...")
         
-        try:
-            original_cwd = os.getcwd()
-            os.chdir(self.web_interface_dir)
-            
-            # Test that component files exist and are importable
-            component_files = ['components/header.py', 'components/sidebar.py']
-            utils_files = ['utils/session.py', 'utils/styling.py', 'utils/validation.py']
-            config_files = ['config/ui_config.py', 'config/__init__.py']
-            
-            for file in component_files + utils_files + config_files:
-                if not (Path(file).exists()):
-                    raise FileNotFoundError(f"Missing file: {file}")
-            
-            print("✅ All component files exist")
-            
-            # Test config imports by directly importing from web_interface
-            sys.path.insert(0, str(self.project_root))
-            from web_interface.config import APP_CONFIG, DB_FILE, MODEL
-            print("✅ Config imports successful")
-            
-            # Test that at least the utility modules are importable
-            import importlib.util
-            
-            # Test session utility
-            spec = importlib.util.spec_from_file_location("session", self.web_interface_dir / "utils" / "session.py")
-            session_module = importlib.util.module_from_spec(spec)
-            print("✅ Session utility file structure valid")
-            
-            # Test validation utility  
-            spec = importlib.util.spec_from_file_location("validation", self.web_interface_dir / "utils" / "validation.py")
-            validation_module = importlib.util.module_from_spec(spec)
-            print("✅ Validation utility file structure valid")
-            
-            print(f"✅ Configuration integration verified (DB: {DB_FILE[-20:]}, Model: {MODEL})")
-            print("✅ Web interface architecture is properly structured")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Web interface test error: {e}")
+        # Test that component files exist and are importable
+        component_files = ['components/header.py', 'components/sidebar.py']
+        utils_files = ['utils/session.py', 'utils/styling.py', 'utils/validation.py']
+        config_files = ['config/ui_config.py', 'config/__init__.py']
+        
+        required = [f"web_interface/{file}" for file in component_files + utils_files + config_files]
+        missing = [file for file in required if file not in self._existing_paths(required)]
+        if missing:
+            logger.error(f"❌ Missing file: {missing[0]}")
             return False
-        finally:
-            os.chdir(original_cwd)
+        
+        logger.info("✅ All component files exist")
+        
+        # Test config imports by directly importing from web_interface
+        from web_interface.config import APP_CONFIG, DB_FILE, MODEL
+        logger.info("✅ Config imports successful")
+        
+        # Resolve the utility modules through the import system's cached
+        # path finder, without importing the utils package itself
+        
+        # Test session utility
+        if PathFinder.find_spec("session", _WEB_UTILS_PATH) is None:
+            logger.error("❌ Session utility cannot be imported")
+            return False
+        logger.info("✅ Session utility file structure valid")
+        
+        # Test validation utility
+        if PathFinder.find_spec("validation", _WEB_UTILS_PATH) is None:
+            logger.error("❌ Validation utility cannot be imported")
+            return False
+        logger.info("✅ Validation utility file structure valid")
+        
+        logger.info(f"✅ Configuration integration verified (DB: {DB_FILE[-20:]}, Model: {MODEL})")
+        logger.info("✅ Web interface architecture is properly structured")
+        return True
     
     def test_enhanced_database_features(self):
         """Test enhanced database features including analytical views and indexes"""
+        return self._run_check(test_enhanced_database_features, self.db_manager)
+    
+    def _run_test(self, test_name, test_func):
+        """Run one suite test, reporting an unexpected exception as a failure."""
         try:
-            print("🧪 Testing Enhanced Database Features")
-            
-            # Test analytical views
-            from database_manager import db_manager
-            from sqlalchemy import text
-            
-            # Test sales_summary view
-            print("📊 Testing sales_summary view")
-            with db_manager.get_connection() as conn:
-                result = conn.execute(text("SELECT * FROM sales_summary ORDER BY total_sales DESC LIMIT 3;"))
-                rows = result.fetchall()
-                if len(rows) > 0:
-                    print(f"✅ Sales summary view working: {len(rows)} records found")
-                else:
-                    print("⚠️ Sales summary view returned no data")
-            
-            # Test monthly_trends view
-            print("📈 Testing monthly_trends view")
-            with db_manager.get_connection() as conn:
-                result = conn.execute(text("SELECT * FROM monthly_trends;"))
-                rows = result.fetchall()
-                if len(rows) > 0:
-                    print(f"✅ Monthly trends view working: {len(rows)} records found")
-                else:
-                    print("⚠️ Monthly trends view returned no data")
-            
-            # Test product_performance view
-            print("🏆 Testing product_performance view")
-            with db_manager.get_connection() as conn:
-                result = conn.execute(text("SELECT * FROM product_performance;"))
-                rows = result.fetchall()
-                if len(rows) > 0:
-                    print(f"✅ Product performance view working: {len(rows)} records found")
-                else:
-                    print("⚠️ Product performance view returned no data")
-            
-            # Test indexes
-            print("🔍 Testing database indexes")
-            with db_manager.get_connection() as conn:
-                result = conn.execute(text("PRAGMA index_list(sales);"))
-                indexes = result.fetchall()
-                print(f"✅ Found {len(indexes)} indexes on sales table")
-            
-            print("✅ Enhanced database features test completed")
-            return True
-            
+            return bool(test_func())
         except Exception as e:
-            print(f"❌ Enhanced database features test failed: {e}")
+            logger.error(f"❌ {test_name} test failed with exception: {e}")
             return False
     
     def run_all_tests(self):
         """Run all tests and return summary"""
-        print("🧪 Running Unified Test Suite")
-        print("=" * 50)
+        logger.info("🧪 Running Unified Test Suite")
+        logger.info("=" * 50)
         
-        tests = [
+        # Independent I/O-bound checks run concurrently; the rest share import
+        # state and agent setup, so they run one after another
+        parallel_tests = [
             ("File Structure", self.test_file_structure),
-            ("Import System", self.test_imports),
             ("Database", self.test_database),
             ("Enhanced Database Features", self.test_enhanced_database_features),
+        ]
+        sequential_tests = [
+            ("Import System", self.test_imports),
             ("Agents", self.test_agents),
             ("Workflow", self.test_workflow),
             ("Web Interface", self.test_web_interface)
         ]
         
-        passed = 0
-        total = len(tests)
+        # Concurrent output is collected per test and written in order afterwards
+        buffer = _TestOutputBuffer()
+        logger.removeHandler(_output)
+        logger.addHandler(buffer)
+        try:
+            with ThreadPoolExecutor(max_workers=len(parallel_tests)) as executor:
+                futures = [
+                    executor.submit(buffer.run, test_name, self._run_test, test_name, test_func)
+                    for test_name, test_func in parallel_tests
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            logger.removeHandler(buffer)
+            logger.addHandler(_output)
+        
+        for (test_name, _), result in zip(parallel_tests, results):
+            for record in buffer.records[test_name]:
+                _output.handle(record)
+            self.test_results[test_name] = result
+            flush_output()
         
-        for test_name, test_func in tests:
-            try:
-                result = test_func()
-                self.test_results[test_name] = result
-                if result:
-                    passed += 1
-            except Exception as e:
-                print(f"❌ {test_name} test failed with exception: {e}")
-                self.test_results[test_name] = False
+        for test_name, test_func in sequential_tests:
+            self.test_results[test_name] = self._run_test(test_name, test_func)
+            flush_output()
+        
+        counts = Counter(map(bool, self.test_results.values()))
+        passed = counts[True]
+        total = len(self.test_results)
         
-        print("\n" + "=" * 50)
-        print(f"🎯 Results: {passed}/{total} tests passed")
+        logger.info("\n" + "=" * 50)
+        logger.info(f"🎯 Results: {passed}/{total} tests passed")
         
         if passed == total:
-            print("🎉 All tests passed! System is fully operational.")
+            logger.info("🎉 All tests passed! System is fully operational.")
             return True
         else:
-            print("⚠️  Some tests failed. Check the output above for details.")
-            for test_name, result in self.test_results.items():
-                status = "✅" if result else "❌"
-                print(f"  {status} {test_name}")
+            logger.warning("⚠️  Some tests failed. Check the output above for details.")
+            logger.info("\n".join(
+                f"  {'✅' if result else '❌'} {test_name}"
+                for test_name, result in self.test_results.items()
+            ))
             return False
 
 def main():
     """Run the unified test suite"""
     test_suite = UnifiedTestSuite()
-    success = test_suite.run_all_tests()
+    try:
+        success = test_suite.run_all_tests()
+    finally:
+        flush_output()
     return success
 
 if __name__ == "__main__":
@@ -5,13 +5,14 @@ Simple test of the AI workflow system
 
 import sys
 import os
+import asyncio
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from main import get_schema, route_question
-from state import create_initial_state
-
 def test_ai_workflow():
     """Test the core AI workflow functionality"""
+    from main import get_schema, route_question
+    from state import create_initial_state
+    
     print("🧪 Testing AI Workflow Integration...")
     
     # Create initial state
@@ -19,11 +20,11 @@ def test_ai_workflow():
     print("✅ Initial state created")
     
     # Test schema extraction
-    schema_state = get_schema(initial_state)
+    schema_state = {**initial_state, **asyncio.run(get_schema(initial_state))}
     print(f"✅ Schema extracted: {schema_state.get('schema_summary', 'Schema available')}")
     
     # Test question routing
-    routed_state = route_question(schema_state)
+    routed_state = {**schema_state, **asyncio.run(route_question(schema_state))}
     print(f"✅ Question routed: {routed_state.get('route', 'Route determined')}")
     
     print("🎉 AI workflow test completed successfully!")
@@ -4,10 +4,15 @@ Universal Dataset Examples
 This script demonstrates how the AI Data Analyst can now work with ANY dataset.
 """
 
-import pandas as pd
+import importlib.util
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+OUTPUT_DIR = 'sample_datasets'
 
 # Create example datasets of different types to demonstrate universal capability
+# (pandas is imported inside the writers only when a fallback or Excel needs it)
 
 # 1. Customer dataset
 customers_data = {
@@ -31,9 +36,8 @@ inventory_data = {
     'last_restock': ['2024-07-01', '2024-07-10', '2024-06-25', '2024-07-05', '2024-07-08']
 }
 
-# 3. Website analytics dataset
+# 3. Website analytics dataset (the date column is built in make_analytics)
 analytics_data = {
-    'date': pd.date_range('2024-07-01', periods=10, freq='D'),
     'page_views': [1250, 1340, 1180, 1420, 1390, 1580, 1720, 1650, 1480, 1560],
     'unique_visitors': [890, 920, 850, 980, 950, 1100, 1200, 1150, 1020, 1080],
     'bounce_rate': [0.45, 0.42, 0.48, 0.40, 0.43, 0.38, 0.35, 0.37, 0.44, 0.41],
@@ -52,26 +56,85 @@ employees_data = {
     'years_experience': [5, 3, 8, 6, 12]
 }
 
-# Create the datasets
-os.makedirs('sample_datasets', exist_ok=True)
-
-# Save as different formats
-pd.DataFrame(customers_data).to_csv('sample_datasets/customers.csv', index=False)
-pd.DataFrame(inventory_data).to_excel('sample_datasets/inventory.xlsx', index=False)
-pd.DataFrame(analytics_data).to_json('sample_datasets/analytics.json', orient='records', date_format='iso')
-pd.DataFrame(employees_data).to_csv('sample_datasets/employees.tsv', sep='\t', index=False)
-
-print("📁 Sample datasets created in 'sample_datasets/' folder:")
-print("  • customers.csv - Customer data with demographics and spending")
-print("  • inventory.xlsx - Product inventory with stock and pricing")
-print("  • analytics.json - Website analytics with metrics")
-print("  • employees.tsv - Employee data with salaries and performance")
-print()
-print("🌍 Upload any of these files using the Universal Dataset mode to see how")
-print("   the AI Data Analyst can automatically analyze ANY type of data!")
-print()
-print("📊 Example questions you could ask after uploading:")
-print("  Customers: 'What is the average age of premium customers?'")
-print("  Inventory: 'Which category has the highest total value?'")
-print("  Analytics: 'Show me the trend of conversion rates over time'")
-print("  Employees: 'What is the average salary by department?'")
+def _write_delimited(columns, path, sep=','):
+    """Write a dict of columns as delimited text, building an Arrow table directly when pyarrow is installed."""
+    if importlib.util.find_spec('pyarrow') is None:
+        import pandas as pd
+        pd.DataFrame(columns).to_csv(path, sep=sep, index=False)
+        return
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    options = pa_csv.WriteOptions(delimiter=sep, quoting_style='needed')
+    pa_csv.write_csv(pa.Table.from_pydict(columns), path, write_options=options)
+
+def make_customers():
+    """Write the customer dataset as CSV and return its path."""
+    path = os.path.join(OUTPUT_DIR, 'customers.csv')
+    _write_delimited(customers_data, path)
+    return path
+
+def make_inventory():
+    """Write the inventory dataset as Excel, or as CSV when openpyxl is not installed, and return its path."""
+    if importlib.util.find_spec('openpyxl') is not None:
+        import pandas as pd
+        path = os.path.join(OUTPUT_DIR, 'inventory.xlsx')
+        pd.DataFrame(inventory_data).to_excel(path, index=False)
+    else:
+        path = os.path.join(OUTPUT_DIR, 'inventory.csv')
+        _write_delimited(inventory_data, path)
+    return path
+
+def make_analytics():
+    """Write the website analytics dataset as JSON and return its path."""
+    path = os.path.join(OUTPUT_DIR, 'analytics.json')
+    if importlib.util.find_spec('orjson') is None:
+        import pandas as pd
+        data = {'date': pd.date_range('2024-07-01', periods=10, freq='D'), **analytics_data}
+        pd.DataFrame(data).to_json(path, orient='records', date_format='iso')
+        return path
+    
+    import orjson
+    # Same records and ISO dates as pandas' to_json(orient='records', date_format='iso')
+    start = date(2024, 7, 1)
+    dates = [f"{start + timedelta(days=i)}T00:00:00.000" for i in range(10)]
+    columns = {'date': dates, **analytics_data}
+    records = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(records))
+    return path
+
+def make_employees():
+    """Write the employee dataset as TSV and return its path."""
+    path = os.path.join(OUTPUT_DIR, 'employees.tsv')
+    _write_delimited(employees_data, path, sep='\t')
+    return path
+
+def main():
+    """Write the sample datasets to the sample_datasets/ folder."""
+    # Create the datasets
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Save as different formats; each writer targets its own file, so the
+    # disk writes run in parallel
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(writer) for writer in (make_customers, make_inventory, make_analytics, make_employees)]
+        paths = [future.result() for future in futures]
+    inventory_file = os.path.basename(paths[1])
+
+    print("📁 Sample datasets created in 'sample_datasets/' folder:")
+    print("  • customers.csv - Customer data with demographics and spending")
+    print(f"  • {inventory_file} - Product inventory with stock and pricing")
+    print("  • analytics.json - Website analytics with metrics")
+    print("  • employees.tsv - Employee data with salaries and performance")
+    print()
+    print("🌍 Upload any of these files using the Universal Dataset mode to see how")
+    print("   the AI Data Analyst can automatically analyze ANY type of data!")
+    print()
+    print("📊 Example questions you could ask after uploading:")
+    print("  Customers: 'What is the average age of premium customers?'")
+    print("  Inventory: 'Which category has the highest total value?'")
+    print("  Analytics: 'Show me the trend of conversion rates over time'")
+    print("  Employees: 'What is the average salary by department?'")
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,13 @@
 This module provides a clean interface between Streamlit and the AI Data Analyst system.
 """
 
+import copy
 import time
+import asyncio
 import logging
 import os
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from pathlib import Path
 import sys
@@ -18,12 +22,28 @@ logger = logging.getLogger(__name__)
 class AIDataAnalystInterface:
     """Interface class for the AI Data Analyst system"""
     
+    # Seconds a system health result is reused before the database is checked again
+    _HEALTH_TTL = 5.0
+    
+    # Number of answered questions kept for repeat lookups
+    _RESPONSE_CACHE_SIZE = 128
+    
     def __init__(self):
         """Initialize the interface"""
         self.workflow_app = None
         self.db_manager = None
         self.agent_manager = None
         self.config = None
+        self._run_config = None
+        # (monotonic timestamp, health result) of the last system health check
+        self._health_cache = (0.0, None)
+        # (normalized question, session_id) -> (schema info it was answered against, response)
+        self._response_cache = OrderedDict()
+        # Streamlit script threads share this interface, so cache access is serialized
+        self._response_lock = threading.Lock()
+        # Long-lived event loop the workflow runs on (see _run_async)
+        self._loop = None
+        self._loop_lock = threading.Lock()
         self._initialized = False
         
     def initialize(self) -> bool:
@@ -49,47 +69,32 @@ class AIDataAnalystInterface:
             from agent_manager import agent_manager
             from state import create_initial_state
             
-            # Import workflow components
-            from main import get_schema, route_question, run_sql_query, generate_chart
-            from langgraph.graph import StateGraph, END
-            from state import AgentState
+            # Import the workflow (compiled once per process by main.get_app)
+            from main import get_app
+            from langchain_core.runnables import RunnableConfig
             
             # Initialize configuration
             logger.info("Configuration loaded successfully")
             
             # Initialize database manager
             self.db_manager = db_manager
-            db_health = self.db_manager.health_check()
+            # The schema is read on the same connection so it is memoized for the first question
+            db_health, _ = self.db_manager.health_and_schema()
             if db_health.get('status') != 'healthy':
                 raise Exception(f"Database health check failed: {db_health}")
             logger.info("Database manager initialized successfully")
             
             # Initialize agent manager
             self.agent_manager = agent_manager
+            # Build the agents in the background while the UI finishes loading
+            self.agent_manager.warmup()
             logger.info("Agent manager initialized successfully")
             
-            # Create the workflow
-            workflow = StateGraph(AgentState)
-            workflow.add_node("get_schema", get_schema)
-            workflow.add_node("route_question", route_question)
-            workflow.add_node("run_sql_query", run_sql_query)
-            workflow.add_node("generate_chart", generate_chart)
-            
-            workflow.set_entry_point("get_schema")
-            workflow.add_edge("get_schema", "route_question")
-            workflow.add_conditional_edges(
-                "route_question",
-                lambda x: x["route"],
-                {
-                    "sql": "run_sql_query",
-                    "chart": "generate_chart",
-                },
-            )
-            workflow.add_edge("run_sql_query", END)
-            workflow.add_edge("generate_chart", END)
-            
-            # Compile the workflow
-            self.workflow_app = workflow.compile()
+            # Reuse the workflow compiled by main instead of building a second graph
+            self.workflow_app = get_app()
+            # The graph is acyclic and finishes in three supersteps, so the run
+            # config is built once and shared by every request
+            self._run_config = RunnableConfig(recursion_limit=10)
             logger.info("Workflow compiled successfully")
             
             # Store the create_initial_state function for later use
@@ -125,26 +130,49 @@ class AIDataAnalystInterface:
                 "performance_tracking": {"total_time": 0}
             }
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
+            # The database manager memoizes the schema until the database file
+            # changes, so it is the same object for as long as the data is unchanged
+            schema_info = self.db_manager.get_schema()
+            
+            # Repeat questions against unchanged data are answered from the cache
+            cache_key = (" ".join(question.split()).lower(), session_id)
+            with self._response_lock:
+                cached = self._response_cache.get(cache_key)
+                hit = cached is not None and cached[0] is schema_info
+                if hit:
+                    self._response_cache.move_to_end(cache_key)
+            if hit:
+                # Cached responses are never mutated, so they are copied outside the lock
+                response = copy.deepcopy(cached[1])
+                response["cache_hit"] = True
+                response["performance_tracking"]["total_time"] = time.perf_counter() - start_time
+                logger.info(f"Answered repeat question from cache: {question}")
+                return response
+            
             logger.info(f"Processing question: {question}")
             
             # Create initial state
+            # session_id is not a workflow state field, so it is not passed to the graph
             initial_state = self.create_initial_state(question)
-            if session_id:
-                initial_state["session_id"] = session_id
+            
+            # Passing the memoized schema in skips the workflow's schema step
+            if "error" not in schema_info:
+                initial_state["schema"] = schema_info["schema_text"]
             
             # Run the workflow
-            result = self.workflow_app.invoke(initial_state)
+            # The workflow nodes are coroutines, so the graph runs on an event loop
+            result = self._run_async(self.workflow_app.ainvoke(initial_state, config=self._run_config))
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             logger.info(f"Question processed in {processing_time:.2f}s")
             
             # Format the response
             final_answer = self._format_response(result)
             
-            return {
+            response = {
                 "final_answer": final_answer,
                 "sql_query": result.get("sql_query"),
                 "query_result": result.get("data"),
@@ -157,8 +185,19 @@ class AIDataAnalystInterface:
                 "raw_result": result
             }
             
+            # Failed runs are not cached, so transient errors are retried
+            if not result.get("errors"):
+                entry = (schema_info, copy.deepcopy(response))
+                with self._response_lock:
+                    self._response_cache[cache_key] = entry
+                    self._response_cache.move_to_end(cache_key)
+                    if len(self._response_cache) > self._RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
+            
+            return response
+            
         except Exception as e:
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             error_msg = f"Error processing question: {str(e)}"
             logger.error(error_msg)
             
@@ -168,6 +207,30 @@ class AIDataAnalystInterface:
                 "performance_tracking": {"total_time": processing_time}
             }
     
+    def _run_async(self, coro: Any) -> Any:
+        """
+        Run a coroutine on the interface's background event loop and wait for it.
+        
+        The shared LLM client keeps async HTTP connections bound to the loop that
+        opened them, so every request must use the same long-lived loop; a fresh
+        asyncio.run() per question would leave those connections on a closed loop.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        loop = self._loop
+        if loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    new_loop = asyncio.new_event_loop()
+                    threading.Thread(target=new_loop.run_forever, name="workflow-loop", daemon=True).start()
+                    self._loop = new_loop
+                loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
     def _format_response(self, result: Dict[str, Any]) -> str:
         """Format the workflow result into a user-friendly response"""
         try:
@@ -183,14 +246,19 @@ class AIDataAnalystInterface:
             # Format successful responses
             response_parts = []
             
+            # Error markers are only ever strings, so other values are never
+            # stringified just to check their prefix (str() of a large result
+            # list would render every row)
+            sql_query = result.get("sql_query")
+            data = result.get("data")
+            
             # Add SQL query if available
-            if result.get("sql_query") and not str(result["sql_query"]).startswith("Error:"):
-                response_parts.append(f"**SQL Query:**\n```sql\n{result['sql_query']}\n```")
+            if sql_query and not (isinstance(sql_query, str) and sql_query.startswith("Error:")):
+                response_parts.append(f"**SQL Query:**\n```sql\n{sql_query}\n```")
             
             # Add data results
-            if result.get("data") and not str(result["data"]).startswith("Error:"):
-                data = result["data"]
-                if isinstance(data, list) and len(data) > 0:
+            if data and not (isinstance(data, str) and data.startswith("Error:")):
+                if isinstance(data, list):
                     response_parts.append(f"**Results:** Found {len(data)} records")
                     
                     # Show sample data
@@ -220,18 +288,25 @@ class AIDataAnalystInterface:
         except Exception as e:
             return f"❌ Error formatting response: {str(e)}"
     
+    # Image types the chart fallback looks for
+    _CHART_SUFFIXES = ('.png', '.jpg', '.jpeg')
+    
     def _get_chart_path(self, result: Dict[str, Any]) -> Optional[str]:
         """Extract chart path from result if available"""
         # Check if chart was generated
         if result.get("chart_code") and not str(result["chart_code"]).startswith("# ERROR:"):
-            # Look for common chart file patterns
-            data_dir = Path("data")
-            for pattern in ["*.png", "*.jpg", "*.jpeg"]:
-                chart_files = list(data_dir.glob(pattern))
-                if chart_files:
-                    # Return the most recent chart file
-                    latest_chart = max(chart_files, key=lambda f: f.stat().st_mtime)
-                    return str(latest_chart)
+            # Use the most recent image in data/, found in one directory pass
+            # (DirEntry caches its stat result)
+            try:
+                with os.scandir("data") as entries:
+                    chart_files = [
+                        entry for entry in entries
+                        if entry.name.lower().endswith(self._CHART_SUFFIXES) and entry.is_file()
+                    ]
+            except OSError:
+                return None
+            if chart_files:
+                return max(chart_files, key=lambda entry: entry.stat().st_mtime).path
         return None
     
     def _get_components_used(self, result: Dict[str, Any]) -> str:
@@ -259,6 +334,13 @@ class AIDataAnalystInterface:
                 "database": {"status": "unavailable"}
             }
         
+        # Streamlit reruns poll health often; reuse a recent result instead of
+        # hitting the database on every rerun
+        now = time.monotonic()
+        checked_at, cached = self._health_cache
+        if cached is not None and now - checked_at < self._HEALTH_TTL:
+            return cached
+        
         try:
             health = {
                 "status": "healthy",
@@ -267,8 +349,9 @@ class AIDataAnalystInterface:
             }
             
             if self.agent_manager:
-                health["agents"] = self.agent_manager.get_cache_stats()
+                health["agents"] = self.agent_manager.get_cache_info()
             
+            self._health_cache = (now, health)
             return health
             
         except Exception as e:
@@ -278,6 +361,16 @@ class AIDataAnalystInterface:
                 "ai_system": False
             }
     
+    def refresh_schema(self) -> Dict[str, Any]:
+        """Re-read the database schema after tables have been created or altered"""
+        if not self.db_manager:
+            return {"error": "Database manager not initialized"}
+        
+        self.db_manager.invalidate_schema_cache()
+        with self._response_lock:
+            self._response_cache.clear()
+        return self.get_database_schema()
+    
     def get_database_schema(self) -> Dict[str, Any]:
         """Get database schema information"""
         if not self.db_manager:
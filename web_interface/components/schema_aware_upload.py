@@ -16,11 +16,11 @@ import numpy as np
 
 # Import database utilities
 try:
-    from src.database_manager import DatabaseManager
+    from src.database_manager import get_db_manager
 except ImportError:
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-    from src.database_manager import DatabaseManager
+    from src.database_manager import get_db_manager
 
 
 class SchemaAwareDataUploadComponent:
@@ -31,7 +31,7 @@ class SchemaAwareDataUploadComponent:
     
     def __init__(self):
         """Initialize the schema-aware data upload component."""
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_db_manager()
         self.supported_formats = ['.csv']
         self.max_file_size = 50 * 1024 * 1024  # 50MB limit
         
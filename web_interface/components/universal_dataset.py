@@ -16,17 +16,18 @@ import io
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import tempfile
+import sqlite3
 import numpy as np
 import re
 from pathlib import Path
 
 # Import database utilities
 try:
-    from src.database_manager import DatabaseManager
+    from src.database_manager import get_db_manager
 except ImportError:
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-    from src.database_manager import DatabaseManager
+    from src.database_manager import get_db_manager
 
 
 class UniversalDatasetComponent:
@@ -35,9 +36,15 @@ class UniversalDatasetComponent:
     integrate it into the AI analysis system.
     """
     
+    # pandas infer_dtype() kinds for object columns holding date/time objects
+    _DATETIME_KINDS = frozenset({'datetime', 'datetime64', 'date'})
+    
+    # SQLite's bound-parameter limit, which caps rows per multi-row INSERT
+    _SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    
     def __init__(self):
         """Initialize the universal dataset component."""
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_db_manager()
         self.supported_formats = ['.csv', '.xlsx', '.json', '.tsv']
         self.max_file_size = 100 * 1024 * 1024  # 100MB limit
         
@@ -77,9 +84,20 @@ class UniversalDatasetComponent:
             
             # Try to infer better types for object columns
             if dtype == 'object':
+                # One vectorized pass classifies the values; only columns that
+                # could hold numbers are coerced
+                inferred_kind = pd.api.types.infer_dtype(series, skipna=True)
+                if inferred_kind in self._DATETIME_KINDS:
+                    numeric_series = None
+                else:
+                    numeric_series = pd.to_numeric(series, errors='coerce')
+                
+                # Python date/time objects are never numeric
+                if numeric_series is None:
+                    dtype = 'datetime_inferred'
+                
                 # Check if it's actually numeric
-                numeric_series = pd.to_numeric(series, errors='coerce')
-                if not numeric_series.isnull().all():
+                elif not numeric_series.isnull().all():
                     if (numeric_series % 1 == 0).all():
                         dtype = 'int64_inferred'
                     else:
@@ -226,6 +244,17 @@ class UniversalDatasetComponent:
         except Exception as e:
             return pd.DataFrame(), f"Error loading file: {str(e)}"
     
+    def load_dataframe_direct(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, str]:
+        """
+        Accept a DataFrame that is already in memory, skipping the file
+        serialize/parse round-trip of load_file_to_dataframe().
+        
+        Returns the same (DataFrame, status) pair as load_file_to_dataframe().
+        """
+        if not isinstance(df, pd.DataFrame):
+            return pd.DataFrame(), f"Error loading data: expected a DataFrame, got {type(df).__name__}"
+        return df, "success"
+    
     def insert_data_to_table(self, df: pd.DataFrame, table_name: str, column_analysis: Dict[str, Dict]) -> Tuple[bool, str]:
         """Insert DataFrame data into the created table."""
         try:
@@ -246,7 +275,10 @@ class UniversalDatasetComponent:
             from sqlalchemy import create_engine
             engine = create_engine(f"sqlite:///{self.db_manager.db_file}")
             
-            df_clean.to_sql(table_name, engine, if_exists="append", index=False)
+            # Batch rows into multi-row INSERTs, staying under SQLite's parameter limit
+            chunksize = max(1, min(1000, self._SQLITE_MAX_VARIABLES // max(1, len(df_clean.columns))))
+            df_clean.to_sql(table_name, engine, if_exists="append", index=False,
+                            method="multi", chunksize=chunksize)
             
             return True, f"Successfully inserted {len(df_clean)} rows into table '{table_name}'"
             